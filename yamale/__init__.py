@@ -1,4 +1,5 @@
-from .yamale import make_schema, make_data, validate
+from . import readers
+from .yamale import make_schema, make_data, validate, iter_data, iter_validate, stream_validate
 from .yamale_testcase import YamaleTestCase
 from .yamale_error import YamaleError
 from .version import __version__
@@ -13,6 +13,7 @@ import glob
 import os
 import re
 import multiprocessing
+from . import readers
 from .yamale_error import YamaleError
 from .schema.validationresults import Result
 from .version import __version__
@@ -22,18 +23,18 @@ import yamale
 schemas = {}
 
 
-def _validate(schema_path, data_path, parser, strict, _raise_error):
+def _validate(schema_path, data_path, parser, strict, _raise_error, schema_cache=None):
     schema = schemas.get(schema_path)
     try:
         if not schema:
-            schema = yamale.make_schema(schema_path, parser)
+            schema = yamale.make_schema(schema_path, parser, cache_dir=schema_cache)
             schemas[schema_path] = schema
     except (SyntaxError, ValueError) as e:
         results = [Result([str(e)])]
         if not _raise_error:
             return results
         raise YamaleError(results)
-    data = yamale.make_data(data_path, parser)
+    data = yamale.iter_data(data_path, parser)
     return yamale.validate(schema, data, strict, _raise_error)
 
 
@@ -65,28 +66,31 @@ def _find_schema(data_path, schema_name):
     return _find_data_path_schema(data_path, schema_name)
 
 
-def _validate_file(yaml_path, schema_name, parser, strict, should_exclude):
+def _validate_file(yaml_path, schema_name, parser, strict, should_exclude, schema_cache=None):
     if should_exclude(yaml_path):
         return
     s = _find_schema(yaml_path, schema_name)
     if not s:
         raise ValueError("Invalid schema name for '{}' or schema not found.".format(schema_name))
-    _validate(s, yaml_path, parser, strict, True)
+    _validate(s, yaml_path, parser, strict, True, schema_cache)
 
 
-def _validate_dir(root, schema_name, cpus, parser, strict, should_exclude):
+def _validate_dir(root, schema_name, cpus, parser, strict, should_exclude, schema_cache=None, include_json=False):
+    extensions = (".yaml", ".yml", ".json") if include_json else (".yaml", ".yml")
     pool = multiprocessing.Pool(processes=cpus)
     res = []
     error_messages = []
     for root, _, files in os.walk(root):
         for f in files:
-            if (f.endswith(".yaml") or f.endswith(".yml")) and f != schema_name:
+            if f.endswith(extensions) and f != schema_name:
                 yaml_path = os.path.join(root, f)
                 if should_exclude(yaml_path):
                     continue
                 schema_path = _find_schema(yaml_path, schema_name)
                 if schema_path:
-                    res.append(pool.apply_async(_validate, (schema_path, yaml_path, parser, strict, False)))
+                    res.append(
+                        pool.apply_async(_validate, (schema_path, yaml_path, parser, strict, False, schema_cache))
+                    )
                 else:
                     print(f"No schema found for: {yaml_path}")
 
@@ -100,7 +104,21 @@ def _validate_dir(root, schema_name, cpus, parser, strict, should_exclude):
         raise ValueError("\n----\n".join(set(error_messages)))
 
 
-def _router(paths, schema_name, cpus, parser, excludes=None, strict=True, verbose=False):
+def _router(
+    paths,
+    schema_name,
+    cpus,
+    parser,
+    excludes=None,
+    strict=True,
+    verbose=False,
+    schema_cache=None,
+    include_json=False,
+    require_c_loader=False,
+):
+    if require_c_loader and readers.active_backend(parser).accelerated is False:
+        raise ValueError('Parser "%s" has no C loader installed' % parser)
+
     EXCLUDE_REGEXES = tuple(re.compile(e) for e in excludes) if excludes else tuple()
 
     def should_exclude(yaml_path):
@@ -117,9 +135,9 @@ def _router(paths, schema_name, cpus, parser, excludes=None, strict=True, verbos
             raise ValueError(f"Path does not exist: {path}")
 
         if os.path.isdir(abs_path):
-            _validate_dir(abs_path, schema_name, cpus, parser, strict, should_exclude)
+            _validate_dir(abs_path, schema_name, cpus, parser, strict, should_exclude, schema_cache, include_json)
         else:
-            _validate_file(abs_path, schema_name, parser, strict, should_exclude)
+            _validate_file(abs_path, schema_name, parser, strict, should_exclude, schema_cache)
 
 
 def main():
@@ -148,7 +166,8 @@ def main():
         "-p",
         "--parser",
         default="pyyaml",
-        help='YAML library to load files. Choices are "ruamel" or "pyyaml" (default).',
+        help='YAML library to load files. Choices are "ruamel", "pyyaml" (default), "json", '
+        'or "auto" for the fastest one installed.',
     )
     parser.add_argument(
         "-n",
@@ -163,6 +182,22 @@ def main():
         action="store_true",
         help="Disable strict mode, unexpected elements in the data will be accepted.",
     )
+    parser.add_argument(
+        "--schema-cache",
+        metavar="DIR",
+        help="Directory to cache built schemas in, so later runs can skip parsing them. Only use a trusted directory.",
+    )
+    parser.add_argument(
+        "-j",
+        "--include-json",
+        action="store_true",
+        help="Also validate .json files found in directories.",
+    )
+    parser.add_argument(
+        "--require-c-loader",
+        action="store_true",
+        help="Fail if the parser would load files with a pure Python loader.",
+    )
     parser.add_argument("-v", "--verbose", action="store_true", help="show verbose information")
     parser.add_argument("-V", "--version", action="version", version=__version__)
     args = parser.parse_args()
@@ -175,6 +210,9 @@ def main():
             excludes=args.exclude,
             strict=not args.no_strict,
             verbose=args.verbose,
+            schema_cache=args.schema_cache,
+            include_json=args.include_json,
+            require_c_loader=args.require_c_loader,
         )
     except (SyntaxError, NameError, TypeError, ValueError) as e:
         print("Validation failed!\n%s" % str(e))
@@ -1,3 +1,7 @@
-from . import yaml_reader
+from . import parse_cache, yaml_reader
 
 parse_yaml = yaml_reader.parse_yaml
+iter_yaml = yaml_reader.iter_yaml
+register_reader = yaml_reader.register_reader
+active_backend = yaml_reader.active_backend
+ParseCache = parse_cache.ParseCache
@@ -0,0 +1,90 @@
+"""
+Read JSON with the json module of the standard library.
+
+JSON is a subset of YAML, and is parsed much faster this way. With
+``parser="auto"``, files ending in ``.json`` and content that starts like a
+JSON object or array are read as JSON first. They are read as YAML instead if
+they don't decode as JSON, or if a YAML loader could load them differently:
+with duplicate keys, numbers PyYAML reads as strings, escaped surrogate pairs,
+or characters YAML doesn't allow.
+"""
+
+import json
+import os
+import re
+
+# The start of a JSON object or array, after an optional UTF-8 byte order mark.
+_json_start_bytes = re.compile(rb"(?:\xef\xbb\xbf)?[ \t\r\n]*[{\[]")
+_json_start_str = re.compile(r"[ \t\r\n]*[{\[]")
+# Characters YAML doesn't allow or reads as line breaks, tabs, which PyYAML
+# doesn't allow between tokens, and escaped UTF-16 surrogates, which json
+# joins in pairs and YAML loaders don't.
+_not_yaml_str = re.compile(r"[^\n\r\x20-\x7e\xa0-\u2027\u202a-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]|\\u[dD][89abAB]")
+_unsigned_exponent = re.compile(r"[eE][0-9]")
+
+
+class JSONReader(object):
+    """Reads JSON documents. A JSON file holds a single document."""
+
+    def load_all(self, data):
+        if not isinstance(data, (str, bytes)):
+            data = data.read()
+        return iter([_loads(data)])
+
+
+def looks_like_json(data, path=None):
+    """
+    Check if ``data``, the str or bytes of a file, should be read as JSON
+    first, from the name of the file or from how it starts. ``data`` is None
+    if it hasn't been read yet.
+    """
+    if path is not None and os.fspath(path).lower().endswith(".json"):
+        return True
+    if data is None:
+        return False
+    if isinstance(data, bytes):
+        return _json_start_bytes.match(data) is not None
+    return _json_start_str.match(data) is not None
+
+
+def try_json(data):
+    """
+    Return the documents of ``data`` if it is JSON that a YAML loader would
+    load the same way, or None if it isn't.
+    """
+    if isinstance(data, bytes):
+        try:
+            data = data.decode("utf-8-sig")
+        except UnicodeDecodeError:  # Other encodings are left to YAML
+            return None
+    if _not_yaml_str.search(data):
+        return None
+    try:
+        return [json.loads(data, parse_constant=_reject_constant, parse_float=_yaml_float, object_pairs_hook=_unique)]
+    except ValueError:
+        return None
+
+
+def _loads(data):
+    return json.loads(data, parse_constant=_reject_constant)
+
+
+def _reject_constant(name):
+    # NaN and Infinity are not JSON, and are strings in YAML.
+    raise ValueError("%s is not valid JSON" % name)
+
+
+def _yaml_float(text):
+    # PyYAML only reads numbers with a dot, and with a sign in the exponent
+    # if there is one, as floats. Other numbers are strings.
+    if "." not in text or _unsigned_exponent.search(text):
+        raise ValueError("%s is not a float in YAML" % text)
+    return float(text)
+
+
+def _unique(pairs):
+    # PyYAML keeps the last value of a duplicate key, ruamel.yaml fails.
+    data = dict(pairs)
+    if len(data) != len(pairs):
+        raise ValueError("Duplicate keys")
+    return data
@@ -0,0 +1,80 @@
+"""
+Keep the documents of parsed files in memory, for long running processes
+that read the same files again and again.
+"""
+
+import collections
+import os
+import pickle
+import threading
+
+from . import yaml_reader
+
+
+class ParseCache(object):
+    """
+    A least recently used cache of the documents of files, for `make_data`.
+
+    Files are looked up by their real path and parser, and parsed again once
+    their modification time or size changes. At most ``max_entries`` files are
+    kept, and if ``max_bytes`` is given, at most that many bytes of documents,
+    measured pickled. Documents are stored pickled, so each call returns a new
+    copy that can be changed without changing the cache.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # (version, pickled documents) by (real path, parser), oldest first.
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def parse(self, path, parser="pyyaml"):
+        """Return the documents of the file at ``path``, like `parse_yaml`."""
+        realpath = os.path.realpath(path)
+        # Stat before reading, so a file changed while it is read is parsed
+        # again next time.
+        stat = os.stat(realpath)
+        key = (realpath, parser.lower())
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                return pickle.loads(entry[1])
+
+        documents = yaml_reader.parse_yaml(path, parser)
+        self._store(key, version, pickle.dumps(documents, pickle.HIGHEST_PROTOCOL))
+        return documents
+
+    def invalidate(self, path):
+        """Forget the documents of the file at ``path``, for all parsers."""
+        realpath = os.path.realpath(path)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == realpath]:
+                self._drop(key)
+
+    def clear(self):
+        """Forget the documents of all files."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _store(self, key, version, blob):
+        with self._lock:
+            self._drop(key)
+            if self.max_bytes is not None and len(blob) > self.max_bytes:
+                return
+            self._entries[key] = (version, blob)
+            self._bytes += len(blob)
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
@@ -0,0 +1,61 @@
+import pytest
+from .. import json_reader, yaml_reader
+
+
+@pytest.mark.parametrize("parser", ["auto", "json"])
+def test_parse_json_file(parser, tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text('{"name": "Zoë", "values": [1, 2.5, 1.5e+3, null, true]}', encoding="utf-8")
+    expected = [{"name": "Zoë", "values": [1, 2.5, 1500.0, None, True]}]
+    assert yaml_reader.parse_yaml(str(path), parser) == expected
+    assert list(yaml_reader.iter_yaml(str(path), parser)) == expected
+
+
+def test_json_content_is_sniffed(monkeypatch):
+    calls = []
+
+    def try_json(data):
+        calls.append(data)
+        return [{"from": "json"}]
+
+    monkeypatch.setattr(json_reader, "try_json", try_json)
+    assert yaml_reader.parse_yaml(content=' \n{"a": 1}', parser="auto") == [{"from": "json"}]
+    assert yaml_reader.parse_yaml(content="a: 1", parser="auto") == [{"a": 1}]
+    # Only "auto" reads JSON first.
+    assert yaml_reader.parse_yaml(content='{"a": 1}') == [{"a": 1}]
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        ("{a: 1}", [{"a": 1}]),
+        ("[1]\n---\n[2]\n", [[1], [2]]),
+        ('{"a": 1}  # comment', [{"a": 1}]),
+        ('{"a": NaN}', [{"a": "NaN"}]),
+        ('{"a": 1e3, "b": 1.5e3}', [{"a": "1e3", "b": "1.5e3"}]),
+        ('{"a": 1, "a": 2}', [{"a": 2}]),
+    ],
+)
+def test_json_falls_back_to_yaml(content, expected):
+    assert yaml_reader.parse_yaml(content=content, parser="auto") == expected
+
+
+@pytest.mark.parametrize(
+    "content",
+    ['{"a": 1e3}', '{"a": 1, "a": 2}', '["\\ud83d\\ude00"]', '["a\u0085b"]', '{\t"a": 1}', b'{"a": "\xff"}'],
+)
+def test_try_json_only_when_yaml_agrees(content):
+    assert json_reader.try_json(content) is None
+
+
+def test_json_reader_only_reads_json():
+    with pytest.raises(ValueError):
+        yaml_reader.parse_yaml(content="a: 1", parser="json")
+
+
+def test_looks_like_json():
+    assert json_reader.looks_like_json(b"\xef\xbb\xbf\r\n [1]")
+    assert json_reader.looks_like_json(None, "DATA.JSON")
+    assert not json_reader.looks_like_json(None, "data.yaml")
+    assert not json_reader.looks_like_json("- [1]")
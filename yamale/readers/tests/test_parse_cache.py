@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+import yamale
+from .. import ParseCache, yaml_reader
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    paths = []
+    parse_yaml = yaml_reader.parse_yaml
+
+    def counted(path=None, parser="pyyaml", content=None):
+        paths.append(os.path.basename(path))
+        return parse_yaml(path, parser, content)
+
+    monkeypatch.setattr(yaml_reader, "parse_yaml", counted)
+    return paths
+
+
+def write(path, text, mtime_ns):
+    path.write_text(text)
+    os.utime(str(path), ns=(mtime_ns, mtime_ns))
+    return str(path)
+
+
+def test_cache_hits_and_changes(parses, tmp_path):
+    cache = ParseCache()
+    path = write(tmp_path / "a.yaml", "a: [1, 2]", 10**18)
+    first = cache.parse(path)
+    first[0]["a"].append(3)
+    assert cache.parse(path) == [{"a": [1, 2]}]
+    assert cache.parse(os.path.join(str(tmp_path), ".", "a.yaml"), "PyYAML") == [{"a": [1, 2]}]
+    assert parses == ["a.yaml"]
+
+    # Another parser is another entry.
+    assert cache.parse(path, "auto") == [{"a": [1, 2]}]
+    assert len(cache) == 2
+
+    # Same size, newer modification time.
+    write(tmp_path / "a.yaml", "a: [3, 4]", 2 * 10**18)
+    assert cache.parse(path) == [{"a": [3, 4]}]
+    assert len(parses) == 3
+
+    cache.invalidate(path)
+    assert len(cache) == 0
+    cache.parse(path)
+    assert len(parses) == 4
+
+
+def test_cache_limits(parses, tmp_path):
+    paths = [write(tmp_path / ("%d.yaml" % i), "a: %d" % i, 10**18) for i in range(3)]
+    cache = ParseCache(max_entries=2)
+    for path in paths[:2] + paths[:1] + paths[2:]:
+        cache.parse(path)
+    assert len(cache) == 2
+    # 1.yaml was used least recently.
+    cache.parse(paths[1])
+    assert parses == ["0.yaml", "1.yaml", "2.yaml", "1.yaml"]
+
+    cache = ParseCache(max_bytes=1)
+    cache.parse(paths[0])
+    assert len(cache) == 0
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_make_data_cache(tmp_path):
+    cache = ParseCache()
+    path = write(tmp_path / "a.yaml", "a: 1\n---\nb: 2", 10**18)
+    assert yamale.make_data(path, cache=cache) == yamale.make_data(path) == [({"a": 1}, path), ({"b": 2}, path)]
+    assert len(cache) == 1
+    empty = write(tmp_path / "empty.yaml", "", 10**18)
+    assert yamale.make_data(empty, cache=cache) == [({}, empty)]
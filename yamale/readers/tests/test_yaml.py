@@ -1,4 +1,5 @@
 import io
+import threading
 import pytest
 from .. import yaml_reader
 from yamale.tests import get_fixture
@@ -47,3 +48,121 @@ def test_keywords(parser):
 def test_nested(parser):
     t = yaml_reader.parse_yaml(NESTED, parser)[0]
     assert t["list"][-1]["string"] == "str()"
+
+
+def yaml_error(parser):
+    if parser == "ruamel":
+        from ruamel.yaml import YAMLError
+    else:
+        from yaml import YAMLError
+    return YAMLError
+
+
+@pytest.mark.parametrize("parser", parsers)
+def test_iter_yaml(parser):
+    documents = yaml_reader.iter_yaml(parser=parser, content="a: 1\n---\nb: [\n")
+    assert next(documents) == {"a": 1}
+    with pytest.raises(yaml_error(parser), match="while parsing a flow node"):
+        next(documents)
+    assert list(yaml_reader.iter_yaml(TYPES, parser)) == yaml_reader.parse_yaml(TYPES, parser)
+    with pytest.raises(TypeError):
+        yaml_reader.iter_yaml(path=TYPES, content="name: Bob")
+
+
+@pytest.mark.parametrize("parser", parsers)
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-8-sig", "utf-16"])
+def test_parse_encodings(parser, encoding, tmp_path):
+    path = tmp_path / "data.yaml"
+    path.write_bytes("name: José\n---\nname: Zoë\n".encode(encoding))
+    expected = [{"name": "José"}, {"name": "Zoë"}]
+    assert yaml_reader.parse_yaml(str(path), parser) == expected
+    assert list(yaml_reader.iter_yaml(str(path), parser)) == expected
+
+
+def test_register_reader():
+    made = []
+
+    class Reader(yaml_reader.PyYAMLReader):
+        def __init__(self):
+            super(Reader, self).__init__()
+            made.append(self)
+
+    yaml_reader.register_reader("Counted", Reader)
+    try:
+        assert yaml_reader.parse_yaml(TYPES, "counted") == yaml_reader.parse_yaml(TYPES)
+        assert yaml_reader.parse_yaml(content="a: 1", parser="COUNTED") == [{"a": 1}]
+        assert len(made) == 1
+
+        # Files read at the same time each get a reader.
+        first = yaml_reader.iter_yaml(content="a: 1\n---\nb: 2", parser="counted")
+        second = yaml_reader.iter_yaml(content="c: 3", parser="counted")
+        assert (next(first), next(second)) == ({"a": 1}, {"c": 3})
+        assert len(made) == 2
+        assert list(first) == [{"b": 2}]
+
+        # Other threads make their own.
+        thread = threading.Thread(target=yaml_reader.parse_yaml, args=(TYPES, "counted"))
+        thread.start()
+        thread.join()
+        assert len(made) == 3
+    finally:
+        y = yaml_reader
+        for registry in (y._readers, y._reader_names, y._parsers, y._document_parsers):
+            del registry["counted"]
+    with pytest.raises(NameError):
+        yaml_reader.parse_yaml(TYPES, "counted")
+
+
+def test_active_backend(accelerated):
+    accelerated("pyyaml", True)
+    accelerated("json", False)
+    assert yaml_reader.active_backend("pyyaml") == ("PyYAML", True)
+    assert yaml_reader.active_backend("JSON") == ("json", False)
+    with pytest.raises(NameError):
+        yaml_reader.active_backend("wat")
+    assert yaml_reader.parse_yaml(TYPES, "auto") == yaml_reader.parse_yaml(TYPES)
+    accelerated("pyyaml", False)
+    assert yaml_reader.active_backend("pyyaml") == ("PyYAML", False)
+
+
+@pytest.fixture
+def accelerated(monkeypatch):
+    yaml_reader._auto_backend.cache_clear()
+    yield lambda parser, value: monkeypatch.setitem(yaml_reader._accelerated, parser, lambda: value)
+    yaml_reader._auto_backend.cache_clear()
+
+
+def test_auto_backend(accelerated):
+    accelerated("pyyaml", False)
+    accelerated("ruamel", False)
+    assert yaml_reader.active_backend() == ("PyYAML", False)
+    with pytest.warns(RuntimeWarning):
+        assert yaml_reader.parse_yaml(content="a: 1", parser="auto") == [{"a": 1}]
+
+    yaml_reader._auto_backend.cache_clear()
+    accelerated("ruamel", True)
+    assert yaml_reader.active_backend("Auto") == ("ruamel", True)
+
+
+def test_auto_after_registering_builtin(accelerated, monkeypatch):
+    y = yaml_reader
+    for registry in (y._readers, y._reader_names, y._parsers, y._document_parsers, y._accelerated):
+        monkeypatch.setitem(registry, "pyyaml", registry["pyyaml"])
+    accelerated("pyyaml", True)
+    accelerated("ruamel", False)
+    assert y.active_backend() == ("PyYAML", True)
+
+    made = []
+
+    class Reader(y.PyYAMLReader):
+        def __init__(self):
+            super(Reader, self).__init__()
+            made.append(self)
+
+    y.register_reader("PyYAML", Reader)
+    # Whether the new reader runs in C is not known.
+    assert y.active_backend() == ("PyYAML", False)
+    with pytest.warns(RuntimeWarning):
+        assert y.parse_yaml(content="a: 1", parser="auto") == [{"a": 1}]
+        assert list(y.iter_yaml(content="a: 1", parser="auto")) == [{"a": 1}]
+    assert len(made) == 1
@@ -1,36 +1,261 @@
 from __future__ import absolute_import
+import collections
+import contextlib
+import functools
+import json
+import threading
+import warnings
 from io import StringIO
 
+from . import json_reader
 
-def _pyyaml(f):
+
+def pyyaml_loader():
+    """Return the PyYAML loader class to use, the libyaml one if available."""
     import yaml
 
     try:
-        Loader = yaml.CSafeLoader
+        return yaml.CSafeLoader
     except AttributeError:  # System does not have libyaml
-        Loader = yaml.SafeLoader
-    return list(yaml.load_all(f, Loader=Loader))
+        return yaml.SafeLoader
+
+
+class PyYAMLReader(object):
+    """Reads YAML with PyYAML, using the libyaml loader if available."""
+
+    def __init__(self):
+        self.Loader = pyyaml_loader()
 
+    def load_all(self, stream):
+        import yaml
 
-def _ruamel(f):
+        return yaml.load_all(stream, Loader=self.Loader)
+
+
+def _ruamel_reader():
     from ruamel.yaml import YAML
 
-    yaml = YAML(typ="safe")
-    return list(yaml.load_all(f))
+    # The safe loader of ruamel.yaml uses its C extension if available.
+    return YAML(typ="safe")
 
 
-_parsers = {"pyyaml": _pyyaml, "ruamel": _ruamel}
+# Reader factories by lowercase name, and the names to show for them.
+_readers = {}
+_reader_names = {}
+# Checks of whether the readers by lowercase name run in C.
+_accelerated = {}
+# Parsers return the list of documents of a stream.
+_parsers = {}
+# Parsers that load one document at a time, as it is iterated over.
+_document_parsers = {}
+# Readers that are not loading anything, for each thread and factory.
+_idle = threading.local()
 
 
-def parse_yaml(path=None, parser="pyyaml", content=None):
+def register_reader(name, factory):
+    """
+    Make a reader available as ``parser=name`` (case insensitive), replacing
+    any reader of that name.
+
+    ``factory`` is called without arguments to make a reader: an object whose
+    ``load_all(data)`` method yields the documents of ``data``. For a path,
+    ``data`` is the raw bytes of the file, or the file opened in binary mode
+    when documents are read one at a time. For ``content=``, it is a text
+    stream. Readers must decode bytes themselves. Readers are kept and reused
+    by the thread that made them, one for each file being read at the same
+    time.
+    """
+    key = name.lower()
+    _readers[key] = factory
+    _reader_names[key] = name
+    # Whether the new reader runs in C is not known.
+    _accelerated.pop(key, None)
+    _auto_backend.cache_clear()
+
+    def documents(f):
+        return _load_all(factory, f)
+
+    def parse(f):
+        return list(_load_all(factory, f))
+
+    _parsers[key] = parse
+    _document_parsers[key] = documents
+
+
+def _load_all(factory, f):
+    try:
+        idle = _idle.readers
+    except AttributeError:
+        idle = _idle.readers = {}
+    readers = idle.setdefault(factory, [])
+    reader = readers.pop() if readers else factory()
+    try:
+        yield from reader.load_all(f)
+    finally:
+        readers.append(reader)
+
+
+# The reader in use for a parser, and whether it runs in C. Whether readers
+# registered with `register_reader` run in C is not known, and is None.
+Backend = collections.namedtuple("Backend", ["parser", "accelerated"])
+
+
+def _has_libyaml():
+    import yaml
+
+    return hasattr(yaml, "CSafeLoader")
+
+
+def _has_ruamel_c():
     try:
-        parse = _parsers[parser.lower()]
+        import ruamel.yaml
+    except ImportError:  # ruamel.yaml is optional
+        return False
+    return bool(getattr(ruamel.yaml, "__with_libyaml__", False))
+
+
+def _has_json_c():
+    return json.scanner.c_make_scanner is not None
+
+
+@functools.lru_cache(maxsize=None)
+def _auto_backend():
+    # Both C loaders are much faster than the pure Python ones. PyYAML is
+    # preferred since it is always installed.
+    for parser in ("pyyaml", "ruamel"):
+        check = _accelerated.get(parser)
+        if check is not None and check():
+            return Backend(_reader_names[parser], True)
+    return Backend(_reader_names["pyyaml"], False)
+
+
+def active_backend(parser="auto"):
+    """
+    Return the `Backend` reading files for ``parser``. For ``"auto"``, this
+    is the fastest one installed.
+    """
+    if parser.lower() == "auto":
+        return _auto_backend()
+    _get_parser(_readers, parser)
+    key = parser.lower()
+    check = _accelerated.get(key)
+    return Backend(_reader_names[key], check() if check else None)
+
+
+def _auto_parser():
+    backend = active_backend()
+    if not backend.accelerated:
+        warnings.warn(
+            "Only pure Python YAML loaders are installed, install PyYAML with libyaml to load YAML much faster",
+            RuntimeWarning,
+        )
+    return backend.parser.lower()
+
+
+def _parse_auto(f):
+    return _parsers[_auto_parser()](f)
+
+
+def _auto_documents(f):
+    return _document_parsers[_auto_parser()](f)
+
+
+register_reader("PyYAML", PyYAMLReader)
+register_reader("ruamel", _ruamel_reader)
+register_reader("json", json_reader.JSONReader)
+_accelerated.update(pyyaml=_has_libyaml, ruamel=_has_ruamel_c, json=_has_json_c)
+# "auto" looks up the reader to use on each call, so it follows readers
+# registered later.
+_reader_names["auto"] = "auto"
+_parsers["auto"] = _parse_auto
+_document_parsers["auto"] = _auto_documents
+# Readers that read JSON documents with the json module instead, where the
+# data is the same.
+_json_subset_parsers = frozenset(["auto"])
+
+
+def _get_parser(parsers, parser):
+    try:
+        return parsers[parser.lower()]
     except KeyError:
-        raise NameError('Parser "' + parser + '" is not supported\nAvailable parsers are listed below:\nPyYAML\nruamel')
+        raise NameError(
+            'Parser "'
+            + parser
+            + '" is not supported\nAvailable parsers are listed below:\n'
+            + "\n".join(_reader_names.values())
+        )
+
+
+def _check_source(path, content):
     if (path is None and content is None) or (path is not None and content is not None):
         raise TypeError("Pass either path= or content=, not both")
+
+
+def _read(path):
+    """
+    Read the raw bytes of a file in one call. The loaders detect the encoding
+    and decode the bytes themselves, libyaml without going through Python.
+    """
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def parse_yaml(path=None, parser="pyyaml", content=None):
+    parse = _get_parser(_parsers, parser)
+    _check_source(path, content)
+    data = _read(path) if path is not None else content
+    if _json_first(parser, data, path):
+        documents = json_reader.try_json(data)
+        if documents is not None:
+            return documents
     if path is not None:
-        with open(path) as f:
-            return parse(f)
+        return parse(data)
     else:
         return parse(StringIO(content))
+
+
+def iter_yaml(path=None, parser="pyyaml", content=None):
+    """
+    Like `parse_yaml`, but yield the documents one at a time, each parsed only
+    when it is reached. The file stays open until all documents have been read
+    or the generator is closed.
+    """
+    documents = _get_parser(_document_parsers, parser)
+    _check_source(path, content)
+    if _json_first(parser, content, path):
+        # A JSON file holds a single document.
+        return _iter_parsed(path, parser, content)
+    return _iter_documents(documents, path, content)
+
+
+def _json_first(parser, data, path):
+    return parser.lower() in _json_subset_parsers and json_reader.looks_like_json(data, path)
+
+
+def _iter_parsed(path, parser, content):
+    yield from parse_yaml(path, parser, content)
+
+
+def _iter_documents(documents, path, content):
+    if path is not None:
+        # Binary files are read in chunks and decoded by the loader.
+        with open(path, "rb") as f:
+            yield from documents(f)
+    else:
+        yield from documents(StringIO(content))
+
+
+@contextlib.contextmanager
+def open_pyyaml_loader(path=None, content=None):
+    """
+    Open a PyYAML loader reading ``path`` or ``content``, for reading its
+    events one at a time.
+    """
+    _check_source(path, content)
+    Loader = pyyaml_loader()
+    with open(path, "rb") if path is not None else StringIO(content) as f:
+        loader = Loader(f)
+        try:
+            yield loader
+        finally:
+            loader.dispose()
@@ -0,0 +1,62 @@
+"""
+On-disk cache of built schemas, so that processes validating against the
+same schema don't have to parse its YAML and expressions again.
+
+Cached schemas are stored with pickle. Only point ``cache_dir`` at a
+directory that is as trusted as the schemas themselves.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+from ..version import __version__
+from .schema import Schema
+
+
+def cache_key(content, parser, validators):
+    """
+    Hash everything that goes into building a schema: the raw schema
+    content, the parser and the validators it may use.
+    """
+    h = hashlib.sha256()
+    h.update(__version__.encode("utf-8"))
+    h.update(b"\0" + parser.lower().encode("utf-8") + b"\0")
+    for name, v in sorted(validators.items()):
+        h.update(("%s=%s.%s\0" % (name, v.__module__, v.__qualname__)).encode("utf-8"))
+    h.update(content)
+    return h.hexdigest()
+
+
+def load(cache_dir, key):
+    """Return the schema cached under ``key``, or None."""
+    try:
+        with open(os.path.join(cache_dir, key + ".pickle"), "rb") as f:
+            schema = pickle.load(f)
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError, AttributeError, ImportError):
+        # Missing, unreadable, truncated, corrupt or stale entries are rebuilt.
+        return None
+    return schema if isinstance(schema, Schema) else None
+
+
+def store(cache_dir, key, schema):
+    """
+    Cache ``schema`` under ``key``. Schemas that can't be pickled, and cache
+    directories that can't be written to, are skipped.
+    """
+    try:
+        data = pickle.dumps(schema, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return
+    tmp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file first so that readers never see half an entry.
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, os.path.join(cache_dir, key + ".pickle"))
+    except OSError:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
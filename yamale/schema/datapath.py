@@ -1,7 +1,18 @@
 class DataPath(object):
+    __slots__ = ("_path",)
+
     def __init__(self, *path):
         self._path = path
 
+    def child(self, key):
+        """
+        Return the path of ``key`` below this path.
+
+        The child only links back to this path; the full tuple of keys is not
+        built until the path is formatted.
+        """
+        return _ChildPath(self, key)
+
     def __add__(self, other):
         dp = DataPath()
         dp._path = self._path + other._path
@@ -12,3 +23,21 @@ class DataPath(object):
 
     def __repr__(self):
         return "DataPath({})".format(repr(self._path))
+
+
+class _ChildPath(DataPath):
+    __slots__ = ("_parent", "_key")
+
+    def __init__(self, parent, key):
+        self._parent = parent
+        self._key = key
+
+    @property
+    def _path(self):
+        keys = []
+        node = self
+        while isinstance(node, _ChildPath):
+            keys.append(node._key)
+            node = node._parent
+        keys.reverse()
+        return node._path + tuple(keys)
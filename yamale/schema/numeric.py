@@ -0,0 +1,109 @@
+"""
+Check num() and int() validators over whole sequences of numbers at once.
+
+Types are checked with one pass over the types of the values. Bounds of
+integers are checked with the builtin min() and max(). If NumPy is installed,
+bounds are checked with array masks, which also give the positions of the
+values that are out of bounds. Whenever there is no exact answer this way,
+the caller checks the values one at a time.
+"""
+
+import functools
+
+from ..validators import constraints as con
+from ..validators import validators as val
+
+# Sequences shorter than this are not worth making an array of.
+numpy_min_length = 1000
+
+# Integers up to this size convert to floats exactly.
+_exact_float = 2**53
+_int64_min, _int64_max = -(2**63), 2**63 - 1
+
+
+@functools.lru_cache(maxsize=None)
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:  # NumPy is optional
+        return None
+    return numpy
+
+
+def failures_finder(validator):
+    """
+    Return a function finding the positions of the values in a sequence that
+    ``validator`` rejects, or None if the validator can't be checked this way.
+
+    The function returns a list of positions, in order, or None if it could
+    not tell for those values.
+    """
+    if type(validator) is val.Integer:
+        value_types = frozenset([int])
+    elif type(validator) is val.Number:
+        value_types = frozenset([int, float])
+    else:
+        return None
+
+    low = high = None
+    for constraint in validator._constraints_inst:
+        if type(constraint) is con.Min:
+            low = constraint.min
+        elif type(constraint) is con.Max:
+            high = constraint.max
+        else:
+            return None
+    # Integer bounds have to fit the integers of an array.
+    as_int64 = value_types == {int} and all(b is None or _int64_min <= b <= _int64_max for b in (low, high))
+
+    def find_failures(values):
+        # bool and other subclasses of int are left to the validator.
+        found_types = set(map(type, values))
+        if not found_types <= value_types:
+            return None
+        if not values or (low is None and high is None):
+            return []
+        numpy = _import_numpy() if len(values) >= numpy_min_length else None
+        if float not in found_types:
+            # Integers compare exactly, and min() and max() run in C.
+            if (low is None or low <= min(values)) and (high is None or max(values) <= high):
+                return []
+            if numpy is None or not as_int64:
+                return _int_failures(values, low, high)
+
+        if numpy is None:
+            return None
+        return _array_failures(numpy, values, found_types, low, high, as_int64)
+
+    return find_failures
+
+
+def _int_failures(values, low, high):
+    if low is None:
+        return [i for i, value in enumerate(values) if value > high]
+    if high is None:
+        return [i for i, value in enumerate(values) if value < low]
+    return [i for i, value in enumerate(values) if not low <= value <= high]
+
+
+def _array_failures(numpy, values, found_types, low, high, as_int64):
+    if as_int64:
+        try:
+            array = numpy.fromiter(values, dtype=numpy.int64, count=len(values))
+        except OverflowError:
+            return None
+    else:
+        array = numpy.fromiter(values, dtype=numpy.float64, count=len(values))
+        # Large integers may have been rounded. Infinities can't be integers,
+        # and NaN compares as False.
+        if int in found_types and ((numpy.abs(array) >= _exact_float) & numpy.isfinite(array)).any():
+            return None
+
+    valid = numpy.ones(len(array), dtype=bool)
+    if low is not None:
+        valid &= array >= low
+    if high is not None:
+        valid &= array <= high
+    # Inverting the mask of valid values also catches NaN, which is never in
+    # bounds.
+    return numpy.flatnonzero(~valid).tolist()
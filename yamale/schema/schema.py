@@ -1,7 +1,30 @@
+import itertools
+from collections.abc import Mapping
+
+from . import numeric
 from .datapath import DataPath
 from .validationresults import ValidationResult
 from .. import syntax, util
 from .. import validators as val
+from ..validators.constraints import Constraint
+
+
+# Containers worth remembering validation results for. YAML loaders return
+# the same object for every alias of an anchor.
+_memo_types = (dict, list)
+
+# Stands in for items missing from a map.
+_missing = object()
+
+# Ways to run validation. The recursive engine runs the compiled plan; the
+# iterative one walks the schema and data with an explicit stack of work.
+_engines = ("recursive", "iterative")
+
+# Kinds of work on the stack of the iterative engine.
+_VISIT, _ITEMS, _EACH, _ALTERNATIVE, _SUBSET, _MEMO = range(6)
+# Kinds of schema nodes for the iterative engine. Nodes after _LEAF
+# validate something inside the data given to them.
+_LEAF, _STATIC_MAP, _STATIC_LIST, _INCLUDE_NODE, _EACH_NODE, _ANY_NODE, _SUBSET_NODE = range(7)
 
 
 class FatalValidationError(Exception):
@@ -24,11 +47,28 @@ class Schema(object):
         # if this schema is included it shares the includes with the top level
         # schema
         self.includes = {} if includes is None else includes
+        self._plan = None
+        self._test = None
+        self._include_error = None
+        self._node_kinds = {}
+        self._node_plans = {}
+
+    def __getstate__(self):
+        # The compiled plan is made of closures, compile again after loading.
+        state = self.__dict__.copy()
+        state["_plan"] = state["_test"] = None
+        # Node kinds and plans are keyed by the ids of the nodes in this process.
+        state["_node_kinds"] = {}
+        state["_node_plans"] = {}
+        return state
 
     def add_include(self, type_dict):
         for include_name, custom_type in type_dict.items():
             t = Schema(custom_type, name=include_name, validators=self.validators, includes=self.includes)
             self.includes[include_name] = t
+        # Includes are linked when compiling, so start over with the new ones.
+        for schema in [self] + list(self.includes.values()):
+            schema._plan = schema._test = None
 
     def _process_schema(self, path, schema_data, validators):
         """
@@ -36,7 +76,7 @@ class Schema(object):
         """
         if util.is_map(schema_data) or util.is_list(schema_data):
             for key, data in util.get_iter(schema_data):
-                schema_data[key] = self._process_schema(path + DataPath(key), data, validators)
+                schema_data[key] = self._process_schema(path.child(key), data, validators)
         else:
             schema_data = self._parse_schema_item(path, schema_data, validators)
         return schema_data
@@ -49,164 +89,864 @@ class Schema(object):
             error = str(e) + " at node '%s'" % str(path)
             raise SyntaxError(error)
 
-    def validate(self, data, data_name, strict):
-        path = DataPath()
+    def compile(self):
+        """
+        Build the validation plan for this schema.
+
+        The schema is walked once and every node is turned into a pair of
+        closures that are already bound to their validator and children, so
+        validating data no longer has to work out what kind of node it is
+        looking at. One closure of each pair reports errors, the other only
+        answers whether the data is valid.
+
+        Every include the schema uses is compiled along with it and linked
+        directly to the include nodes that refer to it. If an include is not
+        defined, validating any data reports it before looking at the data.
+        Includes that lead back to themselves without validating any data in
+        between raise a SyntaxError.
+        """
+        include_schemas, undefined = self._find_includes()
+        if undefined:
+            error = self._include_error = "Include '%s' has not been defined." % undefined[0]
+
+            def fail(*args):
+                raise FatalValidationError(error)
+
+            self._plan = self._test = fail
+            return self
+        self._include_error = None
+
+        self._check_include_cycles(include_schemas)
+        for schema in [self] + include_schemas:
+            schema._node_plans = {}
+            schema._plan, schema._test = schema._compile(schema._schema)
+        return self
+
+    def _find_includes(self):
+        """
+        Find the schemas of all the includes this schema uses, directly or
+        through other includes, and the names of any that are not defined.
+        """
+        found = {}
+        undefined = []
+        pending = [self._schema]
+        while pending:
+            for include_name in _include_names(pending.pop()):
+                if include_name in found or include_name in undefined:
+                    continue
+                include_schema = self.includes.get(include_name)
+                if not include_schema:
+                    undefined.append(include_name)
+                    continue
+                found[include_name] = include_schema
+                pending.append(include_schema._schema)
+        return list(found.values()), undefined
+
+    def _check_include_cycles(self, include_schemas):
+        # An include that is reached again while still looking at the same
+        # data would recurse forever.
+        same_data = {s.name: _include_names(s._schema, same_data=True) for s in include_schemas}
+        done = set()
+
+        def visit(include_name, chain):
+            if include_name in chain:
+                cycle = chain[chain.index(include_name) :] + [include_name]
+                raise SyntaxError("Include cycle without any data in between: %s" % " -> ".join(cycle))
+            if include_name in done:
+                return
+            for next_name in same_data.get(include_name, ()):
+                visit(next_name, chain + [include_name])
+            done.add(include_name)
+
+        for include_name in same_data:
+            visit(include_name, [])
+
+    def is_valid(self, data, strict=True, memo=False, engine="recursive"):
+        """
+        Check if ``data`` is valid without building any error messages.
+
+        With ``memo`` every map and list is only checked once against each
+        schema node, however many times it appears in the data. This pays off
+        when YAML anchors and aliases reuse large blocks.
+
+        ``engine`` is either "recursive" or "iterative". The iterative engine
+        gives the same results without being limited by how deeply the data
+        is nested.
+        """
+        _check_engine(engine)
+        if self._plan is None:
+            self.compile()
+        memo = {} if memo else None
         try:
-            errors = self._validate(self._schema, data, path, strict)
-        except FatalValidationError as e:
-            errors = [e.error]
+            if engine == "iterative":
+                return next(self._iter_stack(data, strict, memo), None) is None
+            return self._test(data, strict, memo)
+        except FatalValidationError:
+            return False
+
+    def validate(self, data, data_name, strict, max_errors=None, memo=False, engine="recursive"):
+        _check_engine(engine)
+        _check_max_errors(max_errors)
+        memo = {} if memo else None
+        if self._plan is None:
+            self.compile()
+
+        if engine == "iterative":
+            errors = list(itertools.islice(self._iter_errors(data, strict, memo, engine), max_errors))
+            return ValidationResult(data_name, self.name, errors)
+
+        # Most data is valid, and proving it is cheaper than describing what
+        # is wrong with it. Only collect errors once we know there are some.
+        try:
+            if self._test(data, strict, memo):
+                return ValidationResult(data_name, self.name, [])
+        except FatalValidationError:
+            pass
+
+        if max_errors is None:
+            try:
+                errors = list(self._iter_plan(data, strict, memo))
+            except FatalValidationError as e:
+                errors = [e.error]
+        else:
+            errors = list(itertools.islice(self._iter_errors(data, strict, memo, engine), max_errors))
         return ValidationResult(data_name, self.name, errors)
 
-    def _validate_item(self, validator, data, path, strict, key):
+    def iter_errors(self, data, strict=True, memo=False, engine="recursive"):
         """
-        Fetch item from data at the position key and validate with validator.
+        Lazily yield the errors found in ``data``.
 
-        Returns an array of errors.
+        Validation only proceeds as far as the caller consumes the generator,
+        so stopping after the first error skips the rest of the data. If a
+        missing include is reached, its error is yielded and iteration stops.
+        See `is_valid` for ``memo`` and ``engine``.
         """
-        errors = []
-        path = path + DataPath(key)
-        try:  # Pull value out of data. Data can be a map or a list/sequence
-            data_item = data[key]
-        except (KeyError, IndexError):  # Oops, that field didn't exist.
-            # Optional? Who cares.
-            if isinstance(validator, val.Validator) and validator.is_optional:
-                return errors
-            # SHUT DOWN EVERYTHING
-            errors.append("%s: Required field missing" % path)
-            return errors
+        _check_engine(engine)
+        return self._iter_errors(data, strict, {} if memo else None, engine)
 
-        return self._validate(validator, data_item, path, strict)
+    def _iter_errors(self, data, strict, memo, engine):
+        try:
+            if engine == "iterative":
+                yield from self._iter_stack(data, strict, memo)
+            else:
+                yield from self._iter_plan(data, strict, memo)
+        except FatalValidationError as e:
+            yield e.error
 
-    def _validate(self, validator, data, path, strict):
-        """
-        Validate data with validator.
-        Special handling of non-primitive validators.
+    def _iter_plan(self, data, strict, memo):
+        if self._plan is None:
+            self.compile()
+        return iter(self._plan(data, DataPath(), strict, memo))
 
-        Returns an array of errors.
+    def _iter_stack(self, data, strict, memo):
         """
+        Yield the errors found in ``data`` without recursing.
+
+        The schema and the data are walked together using a stack of work
+        items, giving the same errors in the same order as the compiled plan.
+        Errors are written to the innermost open buffer. A buffer is opened
+        for each alternative of an any(), map(), list() or subset() that is
+        tried, since its errors are dropped if the alternative accepts the
+        data, and for each node whose errors are kept in the memo. Errors
+        that reach the outermost buffer are final and yielded right away.
+        """
+        if self._plan is None:
+            self.compile()
+        if self._include_error is not None:
+            raise FatalValidationError(self._include_error)
+
+        top = []
+        buffers = [top]
+        sink = top
+        stack = [(_VISIT, self._schema, data, DataPath(), strict)]
+        node_kinds = self._node_kinds
+
+        while stack:
+            if top:
+                yield from top
+                del top[:]
+            work = stack.pop()
+            kind = work[0]
+
+            if kind == _VISIT:
+                _, node, data, path, strict = work
+                try:
+                    node_kind, keys, items = node_kinds[id(node)]
+                except KeyError:
+                    node_kind, keys, items = node_kinds[id(node)] = _node_kind(node)
+
+                if memo is not None and node_kind > _LEAF and type(data) in _memo_types:
+                    key = (id(data), id(node), strict)
+                    entry = memo.get(key)
+                    if entry is None:
+                        # Collect the errors of the node to remember them.
+                        stack.append((_MEMO, key, data, path))
+                        sink = []
+                        buffers.append(sink)
+                    elif entry[2]:
+                        first_prefix, prefix = str(entry[1]), str(path)
+                        # Errors at the top level don't start with their path,
+                        # check the data again instead.
+                        if first_prefix and prefix:
+                            sink.extend(prefix + error[len(first_prefix) :] for error in entry[2])
+                            continue
+                    else:
+                        continue
+
+                if node_kind == _STATIC_MAP:
+                    if not util.is_map(data):
+                        sink.append("%s : '%s' is not a map" % (path, data))
+                        continue
+                    if strict and not keys.issuperset(data):
+                        sink.extend("%s: Unexpected element" % path.child(key) for key in set(data) - keys)
+                    stack.append((_ITEMS, iter(items), data, None, path, strict))
+                    continue
+                if node_kind == _STATIC_LIST:
+                    if not util.is_list(data):
+                        sink.append("%s : '%s' is not a list" % (path, data))
+                        continue
+                    data_length = len(data)
+                    if strict and data_length > len(items):
+                        unexpected = set(range(data_length)) - keys
+                        sink.extend("%s: Unexpected element" % path.child(key) for key in unexpected)
+                    stack.append((_ITEMS, iter(items), data, data_length, path, strict))
+                    continue
+
+                # Optional field with optional value? Who cares.
+                if data is None and node.is_optional and node.can_be_none:
+                    continue
+                if not node.is_valid(data):
+                    prefix = "%s: " % path
+                    sink.extend(prefix + error for error in node.validate(data))
+                    continue
+
+                if node_kind == _INCLUDE_NODE:
+                    if node.strict is not None:
+                        strict = node.strict
+                    stack.append((_VISIT, self.includes[node.include_name]._schema, data, path, strict))
+                elif node_kind == _EACH_NODE:
+                    stack.append((_EACH, node, iter(util.get_iter(data)), path, strict))
+                elif node_kind == _ANY_NODE:
+                    sink = _try_alternatives(node, data, path, strict, stack, buffers, sink)
+                elif node_kind == _SUBSET_NODE:
+                    if util.is_map(data):
+                        elements = ({k: v} for k, v in data.items())
+                    elif util.is_list(data):
+                        elements = iter(data)
+                    else:
+                        elements = iter((data,))
+                    stack.append((_SUBSET, node, elements, None, -1, [], path, strict))
+
+            elif kind == _ITEMS:
+                # Lists come with their length, maps with None.
+                _, items, data, data_length, path, strict = work
+                for key, node, optional in items:
+                    if data_length is None:
+                        data_item = data.get(key, _missing)
+                    else:
+                        data_item = data[key] if key < data_length else _missing
+                    if data_item is _missing:
+                        if not optional:
+                            sink.append("%s: Required field missing" % path.child(key))
+                        continue
+                    stack.append(work)
+                    stack.append((_VISIT, node, data_item, path.child(key), strict))
+                    break
 
-        if util.is_list(validator) or util.is_map(validator):
-            return self._validate_static_map_list(validator, data, path, strict)
+            elif kind == _EACH:
+                _, node, items, path, strict = work
+                for key, data_item in items:
+                    stack.append(work)
+                    sink = _try_alternatives(node, data_item, path.child(key), strict, stack, buffers, sink)
+                    break
 
-        errors = []
-        # Optional field with optional value? Who cares.
-        if data is None and validator.is_optional and validator.can_be_none:
-            return errors
+            elif kind == _ALTERNATIVE:
+                _, node, candidates, tried, sub_errors, data, path, strict = work
+                if candidates:
+                    errors = buffers.pop()
+                    sink = buffers[-1]
+                    if not errors:
+                        continue
+                    sub_errors[candidates[tried]] = errors
+                    tried += 1
+                    if tried < len(candidates):
+                        stack.append((_ALTERNATIVE, node, candidates, tried, sub_errors, data, path, strict))
+                        sink = []
+                        buffers.append(sink)
+                        stack.append((_VISIT, node.validators[candidates[tried]], data, path, strict))
+                        continue
+
+                # All validators failed. The ones that were skipped would have
+                # failed on the type of the data.
+                for i, validator in enumerate(node.validators):
+                    if i in sub_errors:
+                        sink.extend(sub_errors[i])
+                    else:
+                        sink.append("%s: %s" % (path, validator.fail(data)))
+
+            elif kind == _SUBSET:
+                _, node, elements, element, tried, sub_errors, path, strict = work
+                # Until the first element is taken, no validator has been tried.
+                if tried >= 0:
+                    errors = buffers.pop()
+                    sink = buffers[-1]
+                    if errors:
+                        sub_errors.extend(errors)
+                        tried += 1
+                        if tried == len(node.validators):
+                            sink.extend(sub_errors)
+                        else:
+                            stack.append((_SUBSET, node, elements, element, tried, sub_errors, path, strict))
+                            sink = []
+                            buffers.append(sink)
+                            stack.append((_VISIT, node.validators[tried], element, path, strict))
+                            continue
+                for element in elements:
+                    stack.append((_SUBSET, node, elements, element, 0, [], path, strict))
+                    sink = []
+                    buffers.append(sink)
+                    stack.append((_VISIT, node.validators[0], element, path, strict))
+                    break
 
-        errors += self._validate_primitive(validator, data, path)
+            else:  # _MEMO
+                _, key, data, path = work
+                errors = buffers.pop()
+                sink = buffers[-1]
+                # Keep data alive so that its id can't be reused.
+                memo[key] = (data, path, errors)
+                sink.extend(errors)
 
-        if errors:
-            return errors
+        yield from top
+
+    def _compile(self, validator):
+        """
+        Compile a schema node into two functions:
+
+        - ``check(data, path, strict, memo)`` returns an iterable of errors. Leaf
+          nodes return lists; nodes with children return generators, so errors
+          are produced only as they are consumed.
+        - ``test(data, strict, memo)`` returns True if data is valid.
+
+        The functions are also kept by the id of the node, so that a part of
+        the data can be checked against any node of the schema.
+        """
+        plan = self._node_plans[id(validator)] = self._compile_node(validator)
+        return plan
 
+    def _compile_node(self, validator):
+        if util.is_list(validator) or util.is_map(validator):
+            return self._memoize(*self._compile_static_map_list(validator))
+
+        children = None
         if isinstance(validator, val.Include):
-            errors += self._validate_include(validator, data, path, strict)
+            children = self._compile_include(validator)
         elif isinstance(validator, (val.Map, val.List)):
-            errors += self._validate_map_list(validator, data, path, strict)
-
+            children = self._compile_map_list(validator)
         elif isinstance(validator, val.Any):
-            errors += self._validate_any(validator, data, path, strict)
-
+            children = self._compile_any(validator)
         elif isinstance(validator, val.Subset):
-            errors += self._validate_subset(validator, data, path, strict)
+            children = self._compile_subset(validator)
+        check_children, test_children = children or (None, None)
 
-        return errors
+        # Optional field with optional value? Who cares.
+        skip_none = validator.is_optional and validator.can_be_none
+        validate = validator.validate
+        is_valid = validator.is_valid
 
-    def _validate_static_map_list(self, validator, data, path, strict):
-        if util.is_map(validator) and not util.is_map(data):
-            return ["%s : '%s' is not a map" % (path, data)]
+        def check(data, path, strict, memo):
+            if data is None and skip_none:
+                return ()
 
-        if util.is_list(validator) and not util.is_list(data):
-            return ["%s : '%s' is not a list" % (path, data)]
+            errors = validate(data)
+            if errors:
+                prefix = "%s: " % path
+                return [prefix + error for error in errors]
 
-        errors = []
+            if check_children is None:
+                return errors
+            return check_children(data, path, strict, memo)
 
-        if strict:
-            data_keys = set(util.get_keys(data))
-            validator_keys = set(util.get_keys(validator))
-            for key in data_keys - validator_keys:
-                error_path = path + DataPath(key)
-                errors += ["%s: Unexpected element" % error_path]
+        def test(data, strict, memo):
+            if data is None and skip_none:
+                return True
+            if not is_valid(data):
+                return False
+            return test_children is None or test_children(data, strict, memo)
 
-        for key, sub_validator in util.get_iter(validator):
-            errors += self._validate_item(sub_validator, data, path, strict, key)
-        return errors
+        if children is None:
+            return check, test
+        return self._memoize(check, test)
 
-    def _validate_map_list(self, validator, data, path, strict):
-        errors = []
+    def _memoize(self, check, test):
+        """
+        Wrap the functions of a node so that, when a memo is given, they only
+        run once for each map or list, and reuse the result wherever the same
+        object shows up again. Errors are moved to the path they are reused at.
+        """
 
+        def memo_check(data, path, strict, memo):
+            if memo is None or type(data) not in _memo_types:
+                return check(data, path, strict, memo)
+            key = (id(data), check, strict)
+            try:
+                _, first_path, errors = memo[key]
+            except KeyError:
+                errors = list(check(data, path, strict, memo))
+                # Keep data alive so that its id can't be reused.
+                memo[key] = (data, path, errors)
+                return errors
+            if not errors:
+                return errors
+            first_prefix, prefix = str(first_path), str(path)
+            if not first_prefix or not prefix:
+                # Errors at the top level don't start with their path.
+                return check(data, path, strict, memo)
+            return [prefix + error[len(first_prefix) :] for error in errors]
+
+        def memo_test(data, strict, memo):
+            if memo is None or type(data) not in _memo_types:
+                return test(data, strict, memo)
+            key = (id(data), test, strict)
+            try:
+                return memo[key][1]
+            except KeyError:
+                valid = test(data, strict, memo)
+                memo[key] = (data, valid)
+                return valid
+
+        return memo_check, memo_test
+
+    def _compile_static_map_list(self, validator):
+        """
+        Compile a map or list of the schema itself. Its keys, and which of
+        them may be left out, are worked out once here, so each piece of data
+        only costs one pass over those keys.
+        """
+        keys, items = _static_items(validator)
+        items = [(key,) + self._compile(sub_validator) + (optional,) for key, sub_validator, optional in items]
+
+        if util.is_map(validator):
+
+            def check(data, path, strict, memo):
+                if not util.is_map(data):
+                    yield "%s : '%s' is not a map" % (path, data)
+                    return
+
+                if strict and not keys.issuperset(data):
+                    for key in set(data) - keys:
+                        yield "%s: Unexpected element" % path.child(key)
+
+                get = data.get
+                for key, check_one, _, optional in items:
+                    data_item = get(key, _missing)
+                    if data_item is _missing:
+                        # Optional? Who cares.
+                        if not optional:
+                            yield "%s: Required field missing" % path.child(key)
+                        continue
+                    yield from check_one(data_item, path.child(key), strict, memo)
+
+            def test(data, strict, memo):
+                if not util.is_map(data):
+                    return False
+
+                if strict and not keys.issuperset(data):
+                    return False
+
+                get = data.get
+                for key, _, test_one, optional in items:
+                    data_item = get(key, _missing)
+                    if data_item is _missing:
+                        if optional:
+                            continue
+                        return False
+                    if not test_one(data_item, strict, memo):
+                        return False
+                return True
+
+        else:
+            length = len(items)
+
+            def check(data, path, strict, memo):
+                if not util.is_list(data):
+                    yield "%s : '%s' is not a list" % (path, data)
+                    return
+
+                data_length = len(data)
+                if strict and data_length > length:
+                    for key in set(range(data_length)) - keys:
+                        yield "%s: Unexpected element" % path.child(key)
+
+                for key, check_one, _, optional in items:
+                    if key >= data_length:
+                        if not optional:
+                            yield "%s: Required field missing" % path.child(key)
+                        continue
+                    yield from check_one(data[key], path.child(key), strict, memo)
+
+            def test(data, strict, memo):
+                if not util.is_list(data):
+                    return False
+
+                data_length = len(data)
+                if strict and data_length > length:
+                    return False
+
+                for key, _, test_one, optional in items:
+                    if key >= data_length:
+                        if optional:
+                            continue
+                        return False
+                    if not test_one(data[key], strict, memo):
+                        return False
+                return True
+
+        return check, test
+
+    def _compile_map_list(self, validator):
         if not validator.validators:
-            return errors  # No validators, user just wanted a map.
-
-        for key in util.get_keys(data):
-            sub_errors = []
-            for v in validator.validators:
-                err = self._validate_item(v, data, path, strict, key)
-                if err:
-                    sub_errors.append(err)
-
-            if len(sub_errors) == len(validator.validators):
-                # All validators failed, add to errors
-                for err in sub_errors:
-                    errors += err
-
-        return errors
-
-    def _validate_include(self, validator, data, path, strict):
-        include_schema = self.includes.get(validator.include_name)
-        if not include_schema:
-            raise FatalValidationError("Include '%s' has not been defined." % validator.include_name)
-        strict = strict if validator.strict is None else validator.strict
-        return include_schema._validate(include_schema._schema, data, path, strict)
-
-    def _validate_any(self, validator, data, path, strict):
-        if not validator.validators:
-            return []
+            return None  # No validators, user just wanted a map.
+
+        check_item, test_item = self._compile_alternatives(validator.validators, validator.dispatch)
+        if len(validator.validators) == 1:
+            item_kind = _node_kind(validator.validators[0])[0]
+            if item_kind == _LEAF:
+                return self._compile_scalar_map_list(validator, check_item)
+            if item_kind == _INCLUDE_NODE:
+                fields = _record_fields(self.includes[validator.validators[0].include_name]._schema)
+                if fields is not None:
+                    return self._compile_record_map_list(validator, fields, check_item, test_item)
+
+        def check(data, path, strict, memo):
+            for key, data_item in util.get_iter(data):
+                yield from check_item(data_item, path.child(key), strict, memo)
+
+        def test(data, strict, memo):
+            for _, data_item in util.get_iter(data):
+                if not test_item(data_item, strict, memo):
+                    return False
+            return True
+
+        return check, test
+
+    def _compile_scalar_map_list(self, validator, check_item):
+        """
+        Compile a map() or list() of a single validator that checks nothing
+        inside the values. Values are checked in a plain loop and only those
+        that fail go through ``check_item`` to build their errors. Lists of
+        numbers are checked all at once where `numeric` can tell.
+        """
+        accepts = _value_test(validator.validators[0])
+        map_values = isinstance(validator, val.Map)
+        find_failures = None if map_values else numeric.failures_finder(validator.validators[0])
+
+        def check(data, path, strict, memo):
+            failures = None if find_failures is None else find_failures(data)
+            if failures is not None:
+                for i in failures:
+                    yield from check_item(data[i], path.child(i), strict, memo)
+                return
+
+            for key, data_item in util.get_iter(data):
+                if not accepts(data_item):
+                    yield from check_item(data_item, path.child(key), strict, memo)
+
+        def test(data, strict, memo):
+            failures = None if find_failures is None else find_failures(data)
+            if failures is not None:
+                return not failures
+            return all(map(accepts, data.values() if map_values else data))
+
+        return check, test
+
+    def _compile_record_map_list(self, validator, fields, check_item, test_item):
+        """
+        Compile a map() or list() of a single include of records: maps whose
+        values all have scalar validators. Records are checked a field at a
+        time, running each field's validator over the whole column of values,
+        and only the records that fail go through ``check_item`` to build
+        their errors. Data with values that are not maps is checked a record
+        at a time.
+        """
+        keys, fields = fields
+        include_strict = validator.validators[0].strict
+        map_values = isinstance(validator, val.Map)
+
+        def check(data, path, strict, memo):
+            records = list(util.get_iter(data))
+            if not _all_maps(record for _, record in records):
+                for key, record in records:
+                    yield from check_item(record, path.child(key), strict, memo)
+                return
+
+            failed = set()
+            if strict if include_strict is None else include_strict:
+                failed.update(i for i, (_, record) in enumerate(records) if not keys.issuperset(record))
+            for field, accepts, optional in fields:
+                column = [record.get(field, _missing) for _, record in records]
+                if optional:
+                    failed.update(i for i, value in enumerate(column) if value is not _missing and not accepts(value))
+                else:
+                    failed.update(i for i, value in enumerate(column) if value is _missing or not accepts(value))
+
+            for i in sorted(failed):
+                key, record = records[i]
+                yield from check_item(record, path.child(key), strict, memo)
+
+        def test(data, strict, memo):
+            records = data.values() if map_values else data
+            if not _all_maps(records):
+                return all(test_item(record, strict, memo) for record in records)
+
+            if strict if include_strict is None else include_strict:
+                if not all(map(keys.issuperset, records)):
+                    return False
+            for field, accepts, optional in fields:
+                if optional:
+                    column = [record[field] for record in records if field in record]
+                else:
+                    try:
+                        column = [record[field] for record in records]
+                    except KeyError:
+                        return False
+                if not all(map(accepts, column)):
+                    return False
+            return True
+
+        return check, test
+
+    def _compile_include(self, validator):
+        include_schema = self.includes[validator.include_name]
+        include_strict = validator.strict
+
+        if include_strict is None:
+
+            def check(data, path, strict, memo):
+                return include_schema._plan(data, path, strict, memo)
+
+            def test(data, strict, memo):
+                return include_schema._test(data, strict, memo)
 
-        errors = []
+        else:
+
+            def check(data, path, strict, memo):
+                return include_schema._plan(data, path, include_strict, memo)
 
-        sub_errors = []
-        for v in validator.validators:
-            err = self._validate(v, data, path, strict)
-            if err:
-                sub_errors.append(err)
+            def test(data, strict, memo):
+                return include_schema._test(data, include_strict, memo)
 
-        if len(sub_errors) == len(validator.validators):
-            # All validators failed, add to errors
-            for err in sub_errors:
-                errors += err
+        return check, test
+
+    def _compile_any(self, validator):
+        if not validator.validators:
+            return None
 
-        return errors
+        return self._compile_alternatives(validator.validators, validator.dispatch)
 
-    def _validate_subset(self, validator, data, path, strict):
-        def _internal_validate(internal_data):
-            sub_errors = []
-            for v in validator.validators:
-                err = self._validate(v, internal_data, path, strict)
+    def _compile_alternatives(self, validators, dispatch):
+        """
+        Compile validators of which at least one has to accept the data.
+
+        Only the validators that may accept the type of the data are tried,
+        stopping at the first one that does. The check function returns a
+        list of errors.
+        """
+        compiled = [self._compile(v) for v in validators]
+        checks = [check_one for check_one, _ in compiled]
+        tests = [test_one for _, test_one in compiled]
+        fails = [v.fail for v in validators]
+        candidates = dispatch.candidates
+
+        def check(data, path, strict, memo):
+            sub_errors = {}
+            for i in candidates(data):
+                err = list(checks[i](data, path, strict, memo))
                 if not err:
-                    break
-                sub_errors += err
-            else:
-                return sub_errors
-            return []
+                    return ()
+                sub_errors[i] = err
+
+            # All validators failed, add to errors. The ones that were skipped
+            # would have failed on the type of the data.
+            errors = []
+            for i, fail in enumerate(fails):
+                if i in sub_errors:
+                    errors += sub_errors[i]
+                else:
+                    errors.append("%s: %s" % (path, fail(data)))
+            return errors
 
+        def test(data, strict, memo):
+            for i in candidates(data):
+                if tests[i](data, strict, memo):
+                    return True
+            return False
+
+        return check, test
+
+    def _compile_subset(self, validator):
         if not validator.validators:
-            return []
+            return None
+
+        compiled = [self._compile(v) for v in validator.validators]
+        checks = [check_one for check_one, _ in compiled]
+        tests = [test_one for _, test_one in compiled]
+
+        def check(data, path, strict, memo):
+            def _internal_validate(internal_data):
+                sub_errors = []
+                for check_one in checks:
+                    err = list(check_one(internal_data, path, strict, memo))
+                    if not err:
+                        break
+                    sub_errors += err
+                else:
+                    return sub_errors
+                return []
+
+            if util.is_map(data):
+                for k, v in data.items():
+                    yield from _internal_validate({k: v})
+            elif util.is_list(data):
+                for k in data:
+                    yield from _internal_validate(k)
+            else:
+                yield from _internal_validate(data)
 
-        errors = []
-        if util.is_map(data):
-            for k, v in data.items():
-                errors += _internal_validate({k: v})
-        elif util.is_list(data):
-            for k in data:
-                errors += _internal_validate(k)
-        else:
-            errors += _internal_validate(data)
-        return errors
+        def test(data, strict, memo):
+            if util.is_map(data):
+                elements = ({k: v} for k, v in data.items())
+            elif util.is_list(data):
+                elements = data
+            else:
+                elements = (data,)
+            return all(any(test_one(e, strict, memo) for test_one in tests) for e in elements)
 
-    def _validate_primitive(self, validator, data, path):
-        errors = validator.validate(data)
+        return check, test
 
-        for i, error in enumerate(errors):
-            errors[i] = ("%s: " % path) + error
 
-        return errors
+def _static_items(node):
+    """
+    Return the keys of a map or list of the schema itself as a frozenset,
+    and a list of ``(key, node, optional)`` for its items, in order.
+    """
+    items = [(key, child, isinstance(child, val.Validator) and child.is_optional) for key, child in util.get_iter(node)]
+    return frozenset(key for key, _, _ in items), items
+
+
+def _value_test(validator):
+    """
+    Return the quickest function telling if a value is valid for a validator
+    that checks nothing inside it, calling the type check and a single
+    constraint directly where possible.
+    """
+    if type(validator).is_valid is not val.Validator.is_valid:
+        test = validator.is_valid
+    elif not validator._constraints_inst:
+        test = validator._is_valid
+    elif len(validator._constraints_inst) > 1 or type(validator._constraints_inst[0]).accepts is not Constraint.accepts:
+        test = validator.is_valid
+    else:
+        is_type = validator._is_valid
+        satisfies = validator._constraints_inst[0]._is_valid
+
+        def test(value):
+            return bool(is_type(value)) and bool(satisfies(value))
+
+    if validator.is_optional and validator.can_be_none:
+        test_value = test
+
+        def test(value):
+            return value is None or test_value(value)
+
+    return test
+
+
+def _record_fields(node):
+    """
+    If a schema node is a map whose values all have validators that check
+    nothing inside them, return its keys as a frozenset and a list of
+    ``(key, test, optional)`` for its fields, where test is made by
+    `_value_test`. Otherwise return None.
+    """
+    if not util.is_map(node):
+        return None
+    keys, items = _static_items(node)
+    if not all(_node_kind(child)[0] == _LEAF for _, child, _ in items):
+        return None
+    return keys, [(key, _value_test(child), optional) for key, child, optional in items]
+
+
+def _all_maps(values):
+    """Check if all values are maps, looking at each type of value once."""
+    return all(issubclass(value_type, Mapping) for value_type in set(map(type, values)))
+
+
+def _check_engine(engine):
+    if engine not in _engines:
+        raise ValueError("Unknown validation engine '%s', use one of: %s" % (engine, ", ".join(_engines)))
+
+
+def _check_max_errors(max_errors):
+    # Without any error, invalid data would pass as valid.
+    if max_errors is not None and (isinstance(max_errors, bool) or not isinstance(max_errors, int) or max_errors < 1):
+        raise ValueError("max_errors must be None or an integer of at least 1, not %r" % (max_errors,))
+
+
+def _node_kind(node):
+    """
+    Return the kind of a schema node for the iterative engine, along with
+    its keys and items if it is a map or list of the schema itself.
+    """
+    if util.is_map(node):
+        return (_STATIC_MAP,) + _static_items(node)
+    if util.is_list(node):
+        return (_STATIC_LIST,) + _static_items(node)
+    if isinstance(node, val.Include):
+        kind = _INCLUDE_NODE
+    elif isinstance(node, (val.Map, val.List)) and node.validators:
+        kind = _EACH_NODE
+    elif isinstance(node, val.Any) and node.validators:
+        kind = _ANY_NODE
+    elif isinstance(node, val.Subset):
+        kind = _SUBSET_NODE
+    else:
+        kind = _LEAF
+    return kind, None, None
+
+
+def _try_alternatives(node, data, path, strict, stack, buffers, sink):
+    """
+    Push the work to check ``data`` against the validators of ``node`` that
+    may accept it, for the iterative engine, and return the buffer errors
+    are now written to.
+    """
+    candidates = node.dispatch.candidates(data)
+    if len(node.validators) == 1 and candidates:
+        # The errors of the only validator are the errors of the node.
+        stack.append((_VISIT, node.validators[0], data, path, strict))
+        return sink
+    stack.append((_ALTERNATIVE, node, candidates, 0, {}, data, path, strict))
+    if candidates:
+        sink = []
+        buffers.append(sink)
+        stack.append((_VISIT, node.validators[candidates[0]], data, path, strict))
+    return sink
+
+
+def _include_names(node, same_data=False):
+    """
+    List the names of the includes used in a schema node. With ``same_data``
+    only list those that validate the very data given to the node, rather
+    than something inside it.
+    """
+    if isinstance(node, val.Include):
+        return [node.include_name]
+    if same_data:
+        if not isinstance(node, (val.Any, val.Subset)):
+            return []
+        children = node.validators
+    elif util.is_map(node) or util.is_list(node):
+        children = [child for _, child in util.get_iter(node)]
+    else:
+        children = getattr(node, "validators", [])
+    return [include_name for child in children for include_name in _include_names(child, same_data)]
@@ -0,0 +1,356 @@
+"""
+Validate YAML documents while PyYAML parses them, without loading them.
+
+The parser's events are matched against the schema as they arrive. Maps and
+lists of the schema itself, includes, and map() and list() validators without
+constraints are followed into without building their data. Everything else is
+built from its events, only as far as a validator needs it, and checked with
+the compiled plan of its schema node: scalars, the items of map() and list()
+with several validators, and data given to validators such as any(),
+subset() or map(min=1) that look at the whole value. Data with an anchor is
+always built, since aliases may refer to it later.
+
+Errors come out as they would with the whole document loaded. The errors of
+each map of the schema are held until the map ends, so they can be given in
+the order of the schema. Two cases differ from a loaded document: inside a
+map() every duplicate key is checked, and the pairs a merge key (``<<``) brings
+in are checked where the merge key is.
+"""
+
+from .datapath import DataPath
+from .schema import FatalValidationError, _check_max_errors, _node_kind, _static_items
+from .schema import _STATIC_MAP, _STATIC_LIST, _INCLUDE_NODE
+from .validationresults import ValidationResult
+from .. import validators as val
+
+_merge_tag = "tag:yaml.org,2002:merge"
+_value_tag = "tag:yaml.org,2002:value"
+_str_tag = "tag:yaml.org,2002:str"
+_map_tag = "tag:yaml.org,2002:map"
+_seq_tag = "tag:yaml.org,2002:seq"
+
+
+def iter_results(schema, loader, data_name, strict=True, max_errors=None):
+    """
+    Yield the `ValidationResult` of each document read by a PyYAML
+    ``loader``, validating it against ``schema`` as it is parsed.
+    """
+    _check_max_errors(max_errors)
+    if schema._plan is None:
+        schema.compile()
+    import yaml
+
+    walker = _Walker(schema, loader, yaml)
+    loader.get_event()  # StreamStartEvent
+    empty = True
+    while not loader.check_event(yaml.StreamEndEvent):
+        empty = False
+        loader.get_event()  # DocumentStartEvent
+        errors = walker.check_document(loader.get_event(), strict)
+        loader.get_event()  # DocumentEndEvent
+        yield ValidationResult(data_name, schema.name, errors[:max_errors])
+    loader.get_event()  # StreamEndEvent
+
+    # An empty file is checked like make_data() returns it.
+    if empty:
+        yield schema.validate({}, data_name, strict, max_errors=max_errors)
+
+
+class _Walker(object):
+    def __init__(self, schema, loader, yaml):
+        self.schema = schema
+        self.loader = loader
+        self.yaml = yaml
+        self.anchors = {}
+        self.static_items = {}
+        self.new_document()
+
+    def check_document(self, event, strict):
+        if self.schema._include_error is not None:
+            self.skip(event)
+            errors = [self.schema._include_error]
+        else:
+            try:
+                errors = self.check(event, self.schema._schema, self.schema, DataPath(), strict)
+            except FatalValidationError as e:
+                errors = [e.error]
+        self.new_document()
+        return errors
+
+    def new_document(self):
+        """Forget the anchors and objects of a document, like the composer and constructor of PyYAML."""
+        self.anchors = {}
+        # Only data with an anchor can be built again later, through an alias.
+        self.loader.constructed_objects = _AnchoredObjects()
+        self.loader.recursive_objects = {}
+
+    def check(self, event, node, schema, path, strict):
+        """Return the errors of the data starting with ``event`` against ``node``."""
+        if not self.is_plain_collection(event):
+            return self.check_value(self.build(event), node, schema, path, strict)
+
+        is_map = isinstance(event, self.yaml.MappingStartEvent)
+        kind = _node_kind(node)[0]
+        if kind == _STATIC_MAP and is_map:
+            return self.check_static_map(node, schema, path, strict)
+        if kind == _STATIC_LIST and not is_map:
+            return self.check_static_list(node, schema, path, strict)
+        if kind == _INCLUDE_NODE and type(node) is val.Include:
+            # An include accepts any data that is not None.
+            include_schema = schema.includes[node.include_name]
+            if node.strict is not None:
+                strict = node.strict
+            return self.check(event, include_schema._schema, include_schema, path, strict)
+        if type(node) is (val.Map if is_map else val.List) and node.validators and not node._constraints_inst:
+            # Without constraints, the validator only looks at the type.
+            if is_map:
+                return self.check_map_values(node, schema, path, strict)
+            return self.check_list_items(node, schema, path, strict)
+        return self.check_value(self.build(event), node, schema, path, strict)
+
+    def check_value(self, value, node, schema, path, strict):
+        check, _ = schema._node_plans[id(node)]
+        return list(check(value, path, strict, None))
+
+    def check_static_map(self, node, schema, path, strict):
+        keys, items = self.get_static_items(node)
+        # Errors of the values of the map by key, in the order the keys are
+        # first found. Keys that are not in the schema have None.
+        found = {}
+        merged = {}
+        for key, value_event in self.iter_pairs():
+            if key is _merge:
+                merged.update(self.build(value_event, merge=True))
+            elif key in keys:
+                found[key] = self.check(value_event, items[key][0], schema, path.child(key), strict)
+            else:
+                self.skip(value_event)
+                found[key] = None
+
+        errors = []
+        if strict:
+            data_keys = list(merged) + [key for key in found if key not in merged] if merged else found
+            for key in set(data_keys) - keys:
+                errors.append("%s: Unexpected element" % path.child(key))
+        for key, (child, optional) in items.items():
+            if key in found:
+                errors.extend(found[key])
+            elif key in merged:
+                errors.extend(self.check_value(merged[key], child, schema, path.child(key), strict))
+            elif not optional:
+                errors.append("%s: Required field missing" % path.child(key))
+        return errors
+
+    def check_static_list(self, node, schema, path, strict):
+        keys, items = self.get_static_items(node)
+        found = {}
+        length = 0
+        for event in self.iter_items():
+            if length in keys:
+                found[length] = self.check(event, items[length][0], schema, path.child(length), strict)
+            else:
+                self.skip(event)
+            length += 1
+
+        errors = []
+        if strict and length > len(keys):
+            for key in set(range(length)) - keys:
+                errors.append("%s: Unexpected element" % path.child(key))
+        for key, (_, optional) in items.items():
+            if key in found:
+                errors.extend(found[key])
+            elif not optional:
+                errors.append("%s: Required field missing" % path.child(key))
+        return errors
+
+    def check_map_values(self, node, schema, path, strict):
+        errors = []
+        for key, value_event in self.iter_pairs():
+            if key is _merge:
+                for key, value in self.build(value_event, merge=True).items():
+                    errors.extend(self.check_alternatives_value(value, node, schema, path.child(key), strict))
+            else:
+                errors.extend(self.check_alternatives(value_event, node, schema, path.child(key), strict))
+        return errors
+
+    def check_list_items(self, node, schema, path, strict):
+        errors = []
+        for index, event in enumerate(self.iter_items()):
+            errors.extend(self.check_alternatives(event, node, schema, path.child(index), strict))
+        return errors
+
+    def check_alternatives(self, event, node, schema, path, strict):
+        """Return the errors of the data starting with ``event`` against the validators of ``node``."""
+        if len(node.validators) == 1 and self.is_plain_collection(event):
+            sample = {} if isinstance(event, self.yaml.MappingStartEvent) else []
+            if node.dispatch.candidates(sample):
+                # The errors of the only validator are the errors of the item.
+                return self.check(event, node.validators[0], schema, path, strict)
+        return self.check_alternatives_value(self.build(event), node, schema, path, strict)
+
+    def check_alternatives_value(self, value, node, schema, path, strict):
+        sub_errors = {}
+        for i in node.dispatch.candidates(value):
+            errors = self.check_value(value, node.validators[i], schema, path, strict)
+            if not errors:
+                return errors
+            sub_errors[i] = errors
+
+        errors = []
+        for i, validator in enumerate(node.validators):
+            if i in sub_errors:
+                errors.extend(sub_errors[i])
+            else:
+                errors.append("%s: %s" % (path, validator.fail(value)))
+        return errors
+
+    def is_plain_collection(self, event):
+        """Check if ``event`` starts a map or list that is read without building it."""
+        if not isinstance(event, self.yaml.CollectionStartEvent) or event.anchor is not None:
+            return False
+        # Other tags may build something else than a dict or list.
+        return event.tag in (None, "!", _map_tag, _seq_tag)
+
+    def get_static_items(self, node):
+        try:
+            return self.static_items[id(node)]
+        except KeyError:
+            keys, items = _static_items(node)
+            items = {key: (child, optional) for key, child, optional in items}
+            self.static_items[id(node)] = keys, items
+            return keys, items
+
+    def iter_pairs(self):
+        """
+        Yield the key and the first event of the value of each pair of the
+        map being read, up to its end. Merge keys are yielded as `_merge`.
+        """
+        loader = self.loader
+        while not loader.check_event(self.yaml.MappingEndEvent):
+            key_node = self.compose(loader.get_event())
+            if key_node.tag == _merge_tag:
+                yield _merge, loader.get_event()
+                continue
+            if key_node.tag == _value_tag:
+                key_node.tag = _str_tag
+            key = self.construct(key_node)
+            try:
+                hash(key)
+            except TypeError:
+                raise self.yaml.constructor.ConstructorError(
+                    "while constructing a mapping", None, "found unhashable key", key_node.start_mark
+                )
+            yield key, loader.get_event()
+        loader.get_event()
+
+    def iter_items(self):
+        """Yield the first event of each item of the list being read, up to its end."""
+        loader = self.loader
+        while not loader.check_event(self.yaml.SequenceEndEvent):
+            yield loader.get_event()
+        loader.get_event()
+
+    def build(self, event, merge=False):
+        """
+        Build the data starting with ``event``. With ``merge``, build the map
+        a merge key with that data as its value brings in.
+        """
+        node = self.compose(event)
+        if merge:
+            merge_key = self.yaml.ScalarNode(_merge_tag, "<<")
+            node = self.yaml.MappingNode(_map_tag, [(merge_key, node)])
+        return self.construct(node)
+
+    def construct(self, node):
+        """Construct the data of ``node``, as the constructor of PyYAML does for a document."""
+        loader = self.loader
+        data = loader.construct_object(node)
+        while loader.state_generators:
+            state_generators = loader.state_generators
+            loader.state_generators = []
+            for generator in state_generators:
+                for _ in generator:
+                    pass
+        return data
+
+    def skip(self, event):
+        """
+        Read past the data starting with ``event``. Scalars are still built
+        and dropped, so data PyYAML fails to load fails here too.
+        """
+        if not self.is_plain_collection(event):
+            self.build(event)
+        elif isinstance(event, self.yaml.MappingStartEvent):
+            for key, value_event in self.iter_pairs():
+                if key is _merge:
+                    self.build(value_event, merge=True)
+                else:
+                    self.skip(value_event)
+        else:
+            for item_event in self.iter_items():
+                self.skip(item_event)
+
+    def add_anchor(self, anchor, node):
+        self.anchors[anchor] = node
+        self.loader.constructed_objects.anchored.add(node)
+
+    def compose(self, event):
+        """Compose the node starting with ``event``, as the composer of PyYAML does."""
+        yaml = self.yaml
+        loader = self.loader
+        if isinstance(event, yaml.AliasEvent):
+            try:
+                return self.anchors[event.anchor]
+            except KeyError:
+                raise yaml.composer.ComposerError(
+                    None, None, "found undefined alias %r" % event.anchor, event.start_mark
+                )
+
+        tag = event.tag
+        if isinstance(event, yaml.ScalarEvent):
+            if tag is None or tag == "!":
+                tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+            node = yaml.ScalarNode(tag, event.value, event.start_mark, event.end_mark, style=event.style)
+            if event.anchor is not None:
+                self.add_anchor(event.anchor, node)
+            return node
+
+        if isinstance(event, yaml.SequenceStartEvent):
+            if tag is None or tag == "!":
+                tag = loader.resolve(yaml.SequenceNode, None, event.implicit)
+            node = yaml.SequenceNode(tag, [], event.start_mark, None, flow_style=event.flow_style)
+            if event.anchor is not None:
+                self.add_anchor(event.anchor, node)
+            while not loader.check_event(yaml.SequenceEndEvent):
+                node.value.append(self.compose(loader.get_event()))
+        else:
+            if tag is None or tag == "!":
+                tag = loader.resolve(yaml.MappingNode, None, event.implicit)
+            node = yaml.MappingNode(tag, [], event.start_mark, None, flow_style=event.flow_style)
+            if event.anchor is not None:
+                self.add_anchor(event.anchor, node)
+            while not loader.check_event(yaml.MappingEndEvent):
+                key = self.compose(loader.get_event())
+                node.value.append((key, self.compose(loader.get_event())))
+        node.end_mark = loader.get_event().end_mark
+        return node
+
+
+class _AnchoredObjects(dict):
+    """
+    Objects constructed for nodes, keeping only the nodes with an anchor.
+    Other nodes are only found once, so their data can be dropped as soon as
+    it has been checked.
+    """
+
+    def __init__(self):
+        super(_AnchoredObjects, self).__init__()
+        self.anchored = set()
+
+    def __setitem__(self, node, data):
+        if node in self.anchored:
+            super(_AnchoredObjects, self).__setitem__(node, data)
+
+
+# Stands in for merge keys when reading the pairs of a map.
+_merge = object()
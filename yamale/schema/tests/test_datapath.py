@@ -0,0 +1,18 @@
+from ..datapath import DataPath
+
+
+def test_child_path():
+    path = DataPath().child("a").child(0).child("b")
+    assert str(path) == "a.0.b"
+    assert repr(path) == "DataPath(('a', 0, 'b'))"
+
+
+def test_child_of_prefixed_path():
+    path = DataPath("root", 1).child("leaf")
+    assert str(path) == "root.1.leaf"
+
+
+def test_add_child_paths():
+    path = DataPath().child("a") + DataPath().child("b")
+    assert str(path) == "a.b"
+    assert str(DataPath()) == ""
@@ -0,0 +1,41 @@
+import pytest
+
+from .. import numeric
+from ... import validators as val
+
+
+def test_only_plain_numbers():
+    assert numeric.failures_finder(val.String()) is None
+    assert numeric.failures_finder(val.Integer(required=False)) is not None
+    find = numeric.failures_finder(val.Integer(min=0))
+    assert find([1, 2, 3]) == []
+    assert find([]) == []
+    assert find([1, True]) is None
+    assert find([1, 2.0]) is None
+    assert find([1, None]) is None
+
+
+def test_int_failures(monkeypatch):
+    monkeypatch.setattr(numeric, "_import_numpy", lambda: None)
+    values = [0, -1, 5, 10, 11, 2**70]
+    assert numeric.failures_finder(val.Integer(min=0, max=10))(values) == [1, 4, 5]
+    assert numeric.failures_finder(val.Integer(min=0))(values) == [1]
+    assert numeric.failures_finder(val.Number(max=10))(values) == [4, 5]
+    # Floats are left to the validator without NumPy.
+    assert numeric.failures_finder(val.Number(max=10))([1.5] * 2000) is None
+
+
+@pytest.mark.parametrize("length", [10, 2000])
+def test_array_failures(length):
+    pytest.importorskip("numpy")
+    values = [0.5] * length
+    values[1:5] = [float("nan"), -1, 3, float("inf")]
+    assert numeric.failures_finder(val.Number(min=0, max=1))(values) == ([1, 2, 3, 4] if length > 1000 else None)
+
+    values = list(range(length))
+    values[7] = -(2**63)
+    assert numeric.failures_finder(val.Integer(min=0))(values) == [7]
+    values[7] = 2**64
+    assert numeric.failures_finder(val.Integer(min=0))(values) == []
+    values[7] = 2**53 + 1
+    assert numeric.failures_finder(val.Number(max=2**53))(values) in ([7], None)
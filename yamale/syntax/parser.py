@@ -1,4 +1,5 @@
 import ast
+from collections import OrderedDict
 
 from .. import validators as val
 
@@ -28,12 +29,39 @@ def _validate_expr(call_node, validators):
             raise SyntaxError("Argument values must either be constant literals, or else " "reference other validators.")
 
 
+# Checked and compiled expressions, most recently used last. Large schemas
+# repeat the same few expressions over and over.
+_code_cache = OrderedDict()
+_code_cache_size = 1024
+
+
+def _compile_expr(validator_string, validators):
+    # Keyed on the identity of the validators, which the entry keeps alive so
+    # that the id can't be reused by another dict.
+    key = (validator_string, id(validators))
+    try:
+        cached_validators, code = _code_cache[key]
+        if cached_validators is validators:
+            _code_cache.move_to_end(key)
+            return code
+    except KeyError:
+        pass
+
+    tree = ast.parse(validator_string, mode="eval")
+    _validate_expr(tree.body, validators)
+    code = compile(tree, "<ast>", "eval")
+    _code_cache[key] = (validators, code)
+    while len(_code_cache) > _code_cache_size:
+        _code_cache.popitem(last=False)
+    return code
+
+
 def parse(validator_string, validators=None):
     validators = validators or val.DefaultValidators
     try:
-        tree = ast.parse(validator_string, mode="eval")
-        _validate_expr(tree.body, validators)
-        # evaluate with access to a limited global scope only
-        return eval(compile(tree, "<ast>", "eval"), {"__builtins__": safe_builtins}, validators)
+        code = _compile_expr(validator_string, validators)
+        # evaluate with access to a limited global scope only. Every call
+        # builds a new validator, even if the expression was seen before.
+        return eval(code, {"__builtins__": safe_builtins}, validators)
     except (SyntaxError, NameError, TypeError) as e:
         raise SyntaxError("Invalid schema expression: '%s'. " % validator_string + str(e))
@@ -49,3 +49,20 @@ def test_required():
 def test_syntax_error():
     with raises(SyntaxError):
         par.parse("eval()")
+
+
+def test_repeated_expression_builds_new_validator():
+    first = par.parse("int(min=0)")
+    second = par.parse("int(min=0)")
+    assert first == second
+    assert first is not second
+
+
+def test_cache_is_per_validators():
+    class my_validator(Validator):
+        pass
+
+    par.parse("str()")
+    with raises(SyntaxError):
+        par.parse("str()", {"custom": my_validator})
+    assert isinstance(par.parse("str()", {"str": my_validator}), my_validator)
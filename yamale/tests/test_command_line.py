@@ -4,6 +4,7 @@ import contextlib
 import pytest
 
 from .. import command_line
+from .. import readers
 from .. import yamale_error
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
@@ -183,3 +184,64 @@ def test_bad_issue_54():
 
 def test_nested_schema_issue_69():
     command_line._router(["yamale/tests/command_line_fixtures/nestedYaml"], "schema.yaml", 1, "PyYAML")
+
+
+def test_schema_cache(tmp_path):
+    for _ in range(2):
+        command_line._router(
+            ["yamale/tests/command_line_fixtures/yamls/good.yaml"],
+            "schema.yaml",
+            1,
+            "PyYAML",
+            schema_cache=str(tmp_path),
+        )
+        command_line.schemas.clear()
+    assert len(list(tmp_path.glob("*.pickle"))) == 1
+
+
+def test_schema_cache_not_a_directory(tmp_path):
+    cache_file = tmp_path / "cache"
+    cache_file.write_text("")
+    command_line._router(
+        ["yamale/tests/command_line_fixtures/yamls/good.yaml"],
+        "schema.yaml",
+        1,
+        "PyYAML",
+        schema_cache=str(cache_file),
+    )
+    command_line.schemas.clear()
+    assert list(tmp_path.iterdir()) == [cache_file]
+
+
+@pytest.mark.parametrize("include_json", [True, False])
+def test_include_json(include_json, tmp_path):
+    (tmp_path / "schema.yaml").write_text("map: map(str(), int())")
+    (tmp_path / "good.yaml").write_text("map: {a: b}")
+    (tmp_path / "bad.json").write_text('{"map": {"a": 1.5}}')
+    if include_json:
+        with pytest.raises(ValueError) as e:
+            command_line._router([str(tmp_path)], "schema.yaml", 1, "PyYAML", include_json=True)
+        assert "map.a: '1.5' is not a str." in str(e.value)
+    else:
+        command_line._router([str(tmp_path)], "schema.yaml", 1, "PyYAML")
+
+
+def test_require_c_loader(monkeypatch):
+    accelerated = readers.yaml_reader._accelerated
+    monkeypatch.setitem(accelerated, "pyyaml", lambda: True)
+    monkeypatch.setitem(accelerated, "ruamel", lambda: False)
+    readers.yaml_reader._auto_backend.cache_clear()
+    try:
+        args = (["yamale/tests/command_line_fixtures/yamls/good.yaml"], "schema.yaml", 1)
+        command_line._router(*args, "auto", require_c_loader=True)
+        command_line._router(*args, "PyYAML", require_c_loader=True)
+
+        monkeypatch.setitem(accelerated, "pyyaml", lambda: False)
+        readers.yaml_reader._auto_backend.cache_clear()
+        for parser in ("PyYAML", "auto"):
+            with pytest.raises(ValueError) as e:
+                command_line._router(*args, parser, require_c_loader=True)
+            assert "no C loader" in str(e.value)
+        command_line._router(*args, "PyYAML")
+    finally:
+        readers.yaml_reader._auto_backend.cache_clear()
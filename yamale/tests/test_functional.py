@@ -1,10 +1,15 @@
 import io
+import pickle
+from types import MappingProxyType
 import pytest
 import re
+import yaml
 import yamale
 
 from . import get_fixture
 from .. import validators as val
+from ..schema import Schema
+from ..validators.constraints import Constraint
 
 types = {"schema": "types.yaml", "bad": "types_bad_data.yaml", "good": "types_good_data.yaml"}
 
@@ -359,3 +364,345 @@ def count_exception_lines(schema, data, strict=False):
         yamale.validate(schema, data, strict)
     result = e.value.results[0]
     return len(result.errors)
+
+
+def test_make_schema_compiles():
+    schema = yamale.make_schema(get_fixture("types.yaml"))
+    assert schema._plan is not None
+
+
+def test_uncompiled_schema_validates():
+    schema = Schema({"name": "str()", "tags": ["str()"]})
+    assert schema._plan is None
+    result = schema.validate({"name": 1, "tags": ["a", 2]}, "data", True)
+    assert sorted(result.errors) == ["name: '1' is not a str.", "tags.1: Unexpected element"]
+    assert schema._plan is not None
+
+
+def test_iter_errors():
+    errors = types["schema"].iter_errors(types["bad"][0][0])
+    assert next(errors) == "string: '1' is not a str."
+    assert len(list(errors)) == 8
+
+
+def test_iter_errors_undefined_include():
+    errors = list(any_undefined["schema"].iter_errors(any_undefined["bad"][0][0]))
+    assert errors == ["Include 'Wtf' has not been defined."]
+
+
+def test_validate_max_errors():
+    with pytest.raises(ValueError) as e:
+        yamale.validate(types["schema"], types["bad"], max_errors=3)
+    assert len(e.value.results[0].errors) == 3
+
+
+@pytest.mark.parametrize("max_errors", [0, -1, 1.5, True])
+def test_validate_bad_max_errors(max_errors):
+    schema = types["schema"]
+    with pytest.raises(ValueError, match="max_errors must be None or an integer of at least 1"):
+        yamale.validate(schema, types["bad"], max_errors=max_errors)
+    with pytest.raises(ValueError, match="max_errors must be None or an integer of at least 1"):
+        yamale.validate(schema, [], max_errors=max_errors)
+    with pytest.raises(ValueError, match="max_errors must be None or an integer of at least 1"):
+        schema.validate(types["bad"][0][0], "", True, max_errors=max_errors)
+
+
+def test_validate_fail_fast():
+    data = types["bad"] + types["good"] + types["bad"]
+    with pytest.raises(ValueError) as e:
+        yamale.validate(types["schema"], data, fail_fast=True)
+    assert len(e.value.results) == 1
+    assert e.value.results[0].errors == ["string: '1' is not a str."]
+
+
+@pytest.mark.parametrize("data_map", test_data)
+def test_is_valid(data_map):
+    schema = data_map["schema"]
+    for k, data in data_map.items():
+        if k.startswith("good"):
+            assert all(schema.is_valid(d) for d, _ in data)
+        elif k.startswith("bad"):
+            assert not any(schema.is_valid(d) for d, _ in data)
+
+
+class Counted(val.Validator):
+    tag = "counted"
+    calls = 0
+
+    def _is_valid(self, value):
+        Counted.calls += 1
+        return True
+
+
+def make_counted_schema(content):
+    Counted.calls = 0
+    validators = dict(val.DefaultValidators, counted=Counted)
+    return yamale.make_schema(content=content, validators=validators)
+
+
+class NoSpace(Constraint):
+    keywords = {"nospace": bool}
+
+    def is_valid(self, value):
+        if self.is_active and " " in value:
+            return "%s has a space" % value
+        return None
+
+
+class Word(val.String):
+    tag = "word"
+    constraints = val.String.constraints + [NoSpace]
+
+
+def test_constraint_overriding_is_valid():
+    schema = yamale.make_schema(content="a: word(nospace=True)", validators=dict(val.DefaultValidators, word=Word))
+    assert not schema.is_valid({"a": "x y"})
+    with pytest.raises(ValueError) as e:
+        yamale.validate(schema, [({"a": "x y"}, "data")])
+    assert e.value.results[0].errors == ["a: x y has a space"]
+    yamale.validate(schema, [({"a": "xy"}, "data")])
+
+
+def test_any_stops_at_first_match():
+    schema = make_counted_schema("thing: any(str(), counted())")
+    yamale.validate(schema, [({"thing": "a string"}, "data")])
+    assert Counted.calls == 0
+
+
+def test_any_errors_keep_order():
+    schema = yamale.make_schema(content="thing: any(int(), map(), str(max=1))")
+    exp = ["thing: 'ab' is not a int.", "thing: 'ab' is not a map.", "thing: Length of ab is greater than 1"]
+    with pytest.raises(ValueError) as e:
+        yamale.validate(schema, [({"thing": "ab"}, "data")])
+    assert e.value.results[0].errors == exp
+
+
+def test_map_list_stop_at_first_match():
+    schema = make_counted_schema("things: list(int(), counted())\nnames: map(str(), counted())")
+    yamale.validate(schema, [({"things": [1, 2], "names": {"a": "b"}}, "data")])
+    assert Counted.calls == 0
+
+
+def test_map_list_errors_keep_order():
+    schema = yamale.make_schema(content="things: list(int(max=1), str())")
+    exp = ["things.1: 2 is greater than 1", "things.1: '2' is not a str."]
+    with pytest.raises(ValueError) as e:
+        yamale.validate(schema, [({"things": [1, 2, "a"]}, "data")])
+    assert e.value.results[0].errors == exp
+
+
+def test_undefined_include_reported_up_front():
+    schema = yamale.make_schema(content="thing: include('Wtf', required=False)")
+    exp = ["Include 'Wtf' has not been defined."]
+    match_exception_lines(schema, [({}, "data")], exp)
+
+
+def test_external_include_added_after_make_schema():
+    schema = yamale.make_schema(content="person: include('person')")
+    schema.add_include({"person": {"name": "str()"}})
+    yamale.validate(schema, [({"person": {"name": "Bill"}}, "data")])
+
+
+def test_include_cycle():
+    with pytest.raises(SyntaxError) as e:
+        yamale.make_schema(content="a: include('a')\n---\na: any(int(), include('b'))\nb: include('a')")
+    assert "Include cycle without any data in between: a -> b -> a" in str(e.value)
+
+
+def test_memo_matches_aliases():
+    schema = yamale.make_schema(content="servers: list(include('server'))\n---\nserver:\n  name: str()\n  port: int()")
+    data = yamale.make_data(
+        content="""
+servers:
+  - &bad
+    name: a
+    port: nope
+  - *bad
+  - name: b
+    port: 1
+  - *bad
+"""
+    )
+    exp = [
+        "servers.0.port: 'nope' is not a int.",
+        "servers.1.port: 'nope' is not a int.",
+        "servers.3.port: 'nope' is not a int.",
+    ]
+    for memo in (False, True):
+        with pytest.raises(ValueError) as e:
+            yamale.validate(schema, data, memo=memo)
+        assert e.value.results[0].errors == exp
+    assert schema.is_valid(data[0][0], memo=True) is False
+
+
+@pytest.mark.parametrize("data_map", test_data)
+def test_iterative_engine(data_map):
+    schema = data_map["schema"]
+    for k, data in data_map.items():
+        if k == "schema":
+            continue
+        for strict in (True, False):
+            exp = yamale.validate(schema, data, strict, _raise_error=False)
+            results = yamale.validate(schema, data, strict, _raise_error=False, engine="iterative")
+            assert [r.errors for r in results] == [r.errors for r in exp]
+            for d, _ in data:
+                assert schema.is_valid(d, strict, engine="iterative") == schema.is_valid(d, strict)
+
+
+def test_iterative_engine_deep_data():
+    schema = yamale.make_schema(content="tree: include('node')\n---\nnode:\n  child: include('node', required=False)")
+    data = node = {}
+    for _ in range(5000):
+        node["child"] = {}
+        node = node["child"]
+    node["child"] = "leaf"
+
+    assert schema.is_valid({"tree": data}, engine="iterative") is False
+    errors = list(schema.iter_errors({"tree": data}, engine="iterative"))
+    assert errors == ["tree" + ".child" * 5001 + " : 'leaf' is not a map"]
+    with pytest.raises(ValueError):
+        schema.validate({"tree": data}, "", True, engine="stack")
+
+
+def test_static_map_any_mapping():
+    schema = yamale.make_schema(content="a: int()\nb: str(required=False)\nc: list(int(), required=False)")
+    data = MappingProxyType({"a": "x", "d": 1})
+    for engine in ("recursive", "iterative"):
+        assert not schema.is_valid(data, engine=engine)
+        assert list(schema.iter_errors(data, engine=engine)) == ["d: Unexpected element", "a: 'x' is not a int."]
+        assert schema.is_valid(MappingProxyType({"a": 1}), engine=engine)
+
+
+def test_scalar_list_and_map():
+    schema = yamale.make_schema(
+        content="a: list(int(max=3))\nb: map(str(required=False))\nc: list(num(min=0, max=1, none=False))"
+    )
+    assert schema.is_valid({"a": [1, 2], "b": {"x": "y", "z": None}, "c": [0.5]})
+    data = {"a": [1, 5, "x", None], "b": {"x": 1, "z": None}, "c": [0.5, 2, None]}
+    assert not schema.is_valid(data)
+    assert list(schema.iter_errors(data)) == [
+        "a.1: 5 is greater than 3",
+        "a.2: 'x' is not a int.",
+        "a.3: 'None' is not a int.",
+        "b.x: '1' is not a str.",
+        "c.1: 2 is greater than 1.0",
+        "c.2: 'None' is not a num.",
+    ]
+
+
+def test_record_list():
+    schema = yamale.make_schema(
+        content="rows: list(include('row'))\n---\nrow:\n  id: int(min=0)\n  name: str(required=False)"
+    )
+    assert schema.is_valid({"rows": [{"id": 1, "name": "a"}, {"id": 2}]})
+    data = {"rows": [{"id": 1, "x": 1}, {"name": "a"}, {"id": 2}, "row", {"id": -1, "name": 3}]}
+    exp = [
+        "rows.0.x: Unexpected element",
+        "rows.1.id: Required field missing",
+        "rows.3 : 'row' is not a map",
+        "rows.4.id: -1 is less than 0",
+        "rows.4.name: '3' is not a str.",
+    ]
+    assert not schema.is_valid(data)
+    assert list(schema.iter_errors(data)) == exp
+    assert list(schema.iter_errors(data, engine="iterative")) == exp
+    del data["rows"][3]
+    assert list(schema.iter_errors(data)) == exp[:2] + ["rows.3.id: -1 is less than 0", "rows.3.name: '3' is not a str."]
+
+
+def test_iter_validate(tmp_path):
+    schema = yamale.make_schema(content="name: str()")
+    data_path = tmp_path / "data.yaml"
+    data_path.write_text("name: a\n---\nname: 1\n---\nname: [\n")
+    results = yamale.iter_validate(schema, yamale.iter_data(str(data_path)))
+    assert next(results).isValid()
+    result = next(results)
+    assert result.data == str(data_path)
+    assert result.errors == ["name: '1' is not a str."]
+    # Documents are only parsed once they are reached.
+    with pytest.raises(yaml.YAMLError, match="while parsing a flow node"):
+        next(results)
+
+    assert list(yamale.iter_data(content="")) == [({}, None)]
+
+
+@pytest.mark.parametrize("suffix", [".yaml", ".json"])
+def test_pathlib_paths(suffix, tmp_path):
+    schema_path = tmp_path / "schema.yaml"
+    schema_path.write_text("name: str()")
+    data_path = tmp_path / ("data" + suffix)
+    data_path.write_text('{"name": "Bob"}')
+    schema = yamale.make_schema(schema_path)
+    data = yamale.make_data(data_path)
+    assert data == [({"name": "Bob"}, data_path)]
+    assert list(yamale.iter_data(data_path)) == data
+    yamale.validate(schema, data)
+
+
+@pytest.mark.parametrize("data_map", test_data)
+def test_stream_validate(data_map):
+    schema = data_map["schema"]
+    for k, data in data_map.items():
+        if k == "schema":
+            continue
+        for strict in (True, False):
+            exp = yamale.validate(schema, data, strict, _raise_error=False)
+            for _, path in data:
+                results = yamale.stream_validate(schema, path, strict=strict)
+                assert [r.errors for r in results] == [r.errors for r in exp if r.data == path]
+
+
+def test_stream_validate_content():
+    schema = yamale.make_schema(content="a: map(int())\nb: list(include('c'))\n---\nc:\n  d: str()")
+    content = "a: {x: 1, y: z}\nb: [{d: e}, &f {d: 1}, *f, {<<: *f}]\ng: 2\n---\n---\na: {}\nb: []\n"
+    data = yamale.make_data(content=content)
+    exp = [r.errors for r in yamale.validate(schema, data, _raise_error=False)]
+    assert [r.errors for r in yamale.stream_validate(schema, content=content)] == exp
+    assert exp[0] == [
+        "g: Unexpected element",
+        "a.y: 'z' is not a int.",
+        "b.1.d: '1' is not a str.",
+        "b.2.d: '1' is not a str.",
+        "b.3.d: '1' is not a str.",
+    ]
+    assert exp[1:] == [[" : 'None' is not a map"], []]
+
+    results = yamale.stream_validate(schema, content="a: {}\nb: [\n")
+    with pytest.raises(yaml.YAMLError, match="while parsing a flow node"):
+        next(results)
+    assert [r.errors for r in yamale.stream_validate(schema, content="", max_errors=1)] == [
+        ["a: Required field missing"]
+    ]
+    with pytest.raises(ValueError, match="max_errors must be None or an integer of at least 1"):
+        next(yamale.stream_validate(schema, content="a: x", max_errors=0))
+
+
+def test_make_schema_cache_dir(tmp_path):
+    schema_path = get_fixture("custom_types.yaml")
+    schema = yamale.make_schema(schema_path, cache_dir=str(tmp_path))
+    assert len(list(tmp_path.glob("*.pickle"))) == 1
+
+    cached = yamale.make_schema(schema_path, cache_dir=str(tmp_path))
+    assert cached is not schema
+    assert cached.name == schema_path
+    yamale.validate(cached, custom["good"])
+    with pytest.raises(ValueError) as e:
+        yamale.validate(cached, custom["bad"])
+    assert e.value.results[0].errors == yamale.validate(schema, custom["bad"], _raise_error=False)[0].errors
+
+
+@pytest.mark.parametrize("entry", [b"", b"\x80\x05\x95", b"not a pickle", b"\x80\x99junk", pickle.dumps([1])])
+def test_make_schema_cache_dir_bad_entry(entry, tmp_path):
+    content = "name: str()"
+    yamale.make_schema(content=content, cache_dir=str(tmp_path))
+    (path,) = tmp_path.glob("*.pickle")
+    path.write_bytes(entry)
+    assert yamale.make_schema(content=content, cache_dir=str(tmp_path)).is_valid({"name": "a"})
+
+
+def test_make_schema_cache_dir_regex(tmp_path):
+    content = "name: regex('^a', '^b')\nword: str(matches='^c')"
+    yamale.make_schema(content=content, cache_dir=str(tmp_path))
+    cached = yamale.make_schema(content=content, cache_dir=str(tmp_path))
+    assert cached.is_valid({"name": "bob", "word": "cat"})
+    assert not cached.is_valid({"name": "cob", "word": "cat"})
@@ -1,3 +1,6 @@
+import functools
+import re
+import warnings
 from collections.abc import Mapping, Sequence
 
 
@@ -31,6 +34,54 @@ def get_iter(iterable):
         return enumerate(iterable)
 
 
+@functools.lru_cache(maxsize=1024)
+def compile_regex(pattern, flags=0):
+    """
+    Compile ``pattern`` once per process, keeping the 1024 patterns used most
+    recently. Every schema that uses the same pattern with the same flags
+    shares the compiled object.
+    """
+    return re.compile(pattern, flags)
+
+
+def merge_regexes(regexes):
+    """
+    Return a function that tells if a string matches any of ``regexes``.
+
+    Patterns are merged into a single alternation when that can not change
+    what they match: no groups that a backreference could point at, the same
+    flags everywhere and no inline flags that would have to move to the front.
+    Otherwise they are tried one after another.
+    """
+    if len(regexes) == 1:
+        return regexes[0].match
+
+    flags = regexes[0].flags if regexes else 0
+    if regexes and all(r.groups == 0 and r.flags == flags for r in regexes):
+        try:
+            with warnings.catch_warnings():
+                # Python < 3.11 only warns about misplaced inline flags.
+                warnings.simplefilter("error")
+                merged = compile_regex("|".join("(?:%s)" % r.pattern for r in regexes), flags)
+        except (re.error, DeprecationWarning):
+            pass
+        else:
+            if merged.flags == flags:
+                return merged.match
+
+    return _MatchAny(regexes)
+
+
+class _MatchAny(object):
+    __slots__ = ("regexes",)
+
+    def __init__(self, regexes):
+        self.regexes = regexes
+
+    def __call__(self, value):
+        return any(r.match(value) for r in self.regexes)
+
+
 def get_subclasses(cls, _subclasses_yielded=None):
     """
     Generator recursively yielding all subclasses of the passed class (in
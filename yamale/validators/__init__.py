@@ -1,2 +1,2 @@
-from .base import Validator
+from .base import Validator, TypeDispatch
 from .validators import *
@@ -1,8 +1,24 @@
+from datetime import date, datetime
+
+
 class Validator(object):
     """Base class for all Validators"""
 
+    __slots__ = ("args", "kwargs", "is_required", "_value_can_be_none", "_constraints_inst")
     constraints = []
     value_type = None
+    # Types a value must be an instance of for `_is_valid` to accept it.
+    # None means values of any type may be accepted.
+    instance_types = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # A validator that builds its own errors decides validity through them.
+        if "validate" in cls.__dict__ and "is_valid" not in cls.__dict__:
+            cls.is_valid = Validator._is_valid_from_errors
+        # Types declared by a parent say nothing about a new `_is_valid`.
+        if "instance_types" not in cls.__dict__ and ("_is_valid" in cls.__dict__ or "validate" in cls.__dict__):
+            cls.instance_types = None
 
     def __init__(self, *args, **kwargs):
         self.args = args
@@ -21,7 +37,9 @@ class Validator(object):
         constraints = []
         for constraint in constraint_classes:
             constraints.append(constraint(value_type, kwargs))
-        return constraints
+        # Inactive constraints never fail, so only keep the active ones,
+        # cheapest first. The sort is stable, so equal costs keep their order.
+        return sorted((c for c in constraints if c.is_active), key=lambda c: c.cost)
 
     @property
     def tag(self):
@@ -69,7 +87,22 @@ class Validator(object):
         return errors
 
     def is_valid(self, value):
-        return self.validate(value) == []
+        """
+        Check if ``value`` is valid without building any error messages.
+
+        :returns: True if ``value`` is valid, otherwise False.
+        """
+        if not self._is_valid(value):
+            return False
+
+        for constraint in self._constraints_inst:
+            if not constraint.accepts(value):
+                return False
+
+        return True
+
+    def _is_valid_from_errors(self, value):
+        return not self.validate(value)
 
     def fail(self, value):
         """Override to define a custom fail message"""
@@ -82,3 +115,40 @@ class Validator(object):
         # Validators are equal if they have the same args and kwargs.
         eq = [isinstance(other, self.__class__), self.args == other.args, self.kwargs == other.kwargs]
         return all(eq)
+
+
+class TypeDispatch(object):
+    """
+    Index a list of validators by the Python types of the values they may
+    accept, so that validators that are bound to reject a value can be
+    skipped without running them.
+    """
+
+    __slots__ = ("validators", "_candidates")
+
+    # Types YAML loaders produce, indexed up front.
+    common_types = (str, int, float, bool, type(None), dict, list, date, datetime)
+
+    def __init__(self, validators):
+        self.validators = validators
+        self._candidates = {}
+        for value_type in self.common_types:
+            self._candidates[value_type] = self._index(value_type)
+
+    def candidates(self, value):
+        """Return the positions of the validators that may accept ``value``."""
+        value_type = type(value)
+        try:
+            return self._candidates[value_type]
+        except KeyError:
+            candidates = self._candidates[value_type] = self._index(value_type)
+            return candidates
+
+    def _index(self, value_type):
+        candidates = []
+        for i, v in enumerate(self.validators):
+            if v.instance_types is None or issubclass(value_type, v.instance_types):
+                candidates.append(i)
+            elif value_type is type(None) and v.is_optional and v.can_be_none:
+                candidates.append(i)
+        return tuple(candidates)
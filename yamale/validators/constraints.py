@@ -9,10 +9,23 @@ from .. import util
 
 
 class Constraint(object):
+    __slots__ = ("is_active",)
+
     keywords = {}  # Keywords and types accepted by this constraint
-    is_active = False
+    modifiers = ()  # Keywords that only change how the other keywords apply
+    # Relative cost of checking a value, used to run cheap constraints first:
+    # 0 for comparisons and scans of the value, 2 for parsing or regexes and
+    # 3 for constraints that run other validators.
+    cost = 1
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # A constraint that builds its own errors decides validity through them.
+        if "is_valid" in cls.__dict__ and "accepts" not in cls.__dict__:
+            cls.accepts = Constraint._accepts_from_error
 
     def __init__(self, value_type, kwargs):
+        self.is_active = False
         self._parseKwargs(kwargs)
 
     def _parseKwargs(self, kwargs):
@@ -26,8 +39,9 @@ class Constraint(object):
         except KeyError:
             return None
 
-        # Activate this constraint
-        self.is_active = True
+        # Activate this constraint, unless the keyword only modifies others
+        if key not in self.modifiers:
+            self.is_active = True
 
         if isinstance(value, kwtype):
             # value already correct type, return
@@ -55,12 +69,21 @@ class Constraint(object):
 
         return None
 
+    def accepts(self, value):
+        """Return True if ``value`` satisfies this constraint, without building an error."""
+        return not self.is_active or bool(self._is_valid(value))
+
+    def _accepts_from_error(self, value):
+        return not self.is_valid(value)
+
     def _fail(self, value):
         return "'%s' violates %s." % (value, self.__class__.__name__)
 
 
 class Min(Constraint):
+    __slots__ = ("keywords", "min")
     fail = "%s is less than %s"
+    cost = 0
 
     def __init__(self, value_type, kwargs):
         self.keywords = {"min": value_type}
@@ -74,7 +97,9 @@ class Min(Constraint):
 
 
 class Max(Constraint):
+    __slots__ = ("keywords", "max")
     fail = "%s is greater than %s"
+    cost = 0
 
     def __init__(self, value_type, kwargs):
         self.keywords = {"max": value_type}
@@ -88,8 +113,10 @@ class Max(Constraint):
 
 
 class LengthMin(Constraint):
+    __slots__ = ("min",)
     keywords = {"min": int}
     fail = "Length of %s is less than %s"
+    cost = 0
 
     def _is_valid(self, value):
         return self.min <= len(value)
@@ -99,8 +126,10 @@ class LengthMin(Constraint):
 
 
 class LengthMax(Constraint):
+    __slots__ = ("max",)
     keywords = {"max": int}
     fail = "Length of %s is greater than %s"
+    cost = 0
 
     def _is_valid(self, value):
         return self.max >= len(value)
@@ -110,12 +139,24 @@ class LengthMax(Constraint):
 
 
 class Key(Constraint):
+    __slots__ = ("key",)
     keywords = {"key": Validator}
     fail = "Key error - %s"
+    cost = 3
+
+    def is_valid(self, value):
+        # Build the errors while checking the keys instead of checking every
+        # key a second time once one has failed.
+        if not self.is_active:
+            return None
+
+        return self._fail(value) or None
+
+    accepts = Constraint.accepts
 
     def _is_valid(self, value):
         for k in value.keys():
-            if self.key.validate(k) != []:
+            if not self.key.is_valid(k):
                 return False
         return True
 
@@ -127,8 +168,11 @@ class Key(Constraint):
 
 
 class StringEquals(Constraint):
+    __slots__ = ("equals", "ignore_case")
     keywords = {"equals": str, "ignore_case": bool}
     fail = "%s does not equal %s"
+    modifiers = ("ignore_case",)
+    cost = 0
 
     def _is_valid(self, value):
         # Check if the function has only been called due to ignore_case
@@ -148,8 +192,11 @@ class StringEquals(Constraint):
 
 
 class StringStartsWith(Constraint):
+    __slots__ = ("starts_with", "ignore_case")
     keywords = {"starts_with": str, "ignore_case": bool}
     fail = "%s does not start with %s"
+    modifiers = ("ignore_case",)
+    cost = 0
 
     def _is_valid(self, value):
         # Check if the function has only been called due to ignore_case
@@ -173,8 +220,11 @@ class StringStartsWith(Constraint):
 
 
 class StringEndsWith(Constraint):
+    __slots__ = ("ends_with", "ignore_case")
     keywords = {"ends_with": str, "ignore_case": bool}
     fail = "%s does not end with %s"
+    modifiers = ("ignore_case",)
+    cost = 0
 
     def _is_valid(self, value):
         # Check if the function has only been called due to ignore_case
@@ -198,8 +248,10 @@ class StringEndsWith(Constraint):
 
 
 class StringMatches(Constraint):
+    __slots__ = ("matches", "_flags", "_regex")
     keywords = {"matches": str}
     fail = "%s is not a regex match."
+    cost = 2
 
     _regex_flags = {"ignore_case": re.I, "multiline": re.M, "dotall": re.S}
 
@@ -209,11 +261,11 @@ class StringMatches(Constraint):
             self._flags |= v if kwargs.pop(k, False) else 0
 
         super(StringMatches, self).__init__(value_type, kwargs)
+        self._regex = None if self.matches is None else util.compile_regex(self.matches, self._flags)
 
     def _is_valid(self, value):
-        if self.matches is not None:
-            regex = re.compile(self.matches, self._flags)
-            return regex.match(value)
+        if self._regex is not None:
+            return self._regex.match(value)
         else:
             return True
 
@@ -222,37 +274,49 @@ class StringMatches(Constraint):
 
 
 class CharacterExclude(Constraint):
+    __slots__ = ("exclude", "ignore_case")
     keywords = {"exclude": str, "ignore_case": bool}
     fail = "'%s' contains excluded character '%s'"
+    modifiers = ("ignore_case",)
+    cost = 0
+
+    def is_valid(self, value):
+        if not self.is_active:
+            return None
+
+        char = self._excluded_char(value)
+        if char is not None:
+            return self.fail % (value, char)
+
+        return None
+
+    accepts = Constraint.accepts
 
     def _is_valid(self, value):
+        return self._excluded_char(value) is None
+
+    def _excluded_char(self, value):
+        """Return the first excluded character found in ``value``, if any."""
         # Check if the function has only been called due to ignore_case
         if self.exclude is not None:
             for char in self.exclude:
-                if self.ignore_case is not None:
-                    if not self.ignore_case:
-                        if char in value:
-                            self._failed_char = char
-                            return False
-                    else:
-                        if char.casefold() in value.casefold():
-                            self._failed_char = char
-                            return False
+                if self.ignore_case:
+                    if char.casefold() in value.casefold():
+                        return char
                 else:
                     if char in value:
-                        self._failed_char = char
-                        return False
-            return True
-        else:
-            return True
+                        return char
+        return None
 
     def _fail(self, value):
-        return self.fail % (value, self._failed_char)
+        return self.fail % (value, self._excluded_char(value))
 
 
 class IpVersion(Constraint):
+    __slots__ = ("version",)
     keywords = {"version": int}
     fail = "IP version of %s is not %s"
+    cost = 2
 
     def _is_valid(self, value):
         try:
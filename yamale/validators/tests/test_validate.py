@@ -245,3 +245,92 @@ def test_semver():
     assert not v.is_valid("+justmeta")
     assert not v.is_valid("9.8.7+meta+meta")
     assert not v.is_valid("9.8.7-whatever+meta+meta")
+
+
+def test_is_valid_follows_custom_validate():
+    class Even(val.Integer):
+        def validate(self, value):
+            errors = super(Even, self).validate(value)
+            if not errors and value % 2:
+                errors.append("%s is odd" % value)
+            return errors
+
+    v = Even(min=0)
+    assert v.is_valid(2)
+    assert not v.is_valid(3)
+    assert not v.is_valid(-2)
+
+
+def test_regex_multiple_patterns():
+    v = val.Regex(r"\d+$", r"[a-z]+$")
+    assert v.is_valid("123")
+    assert v.is_valid("abc")
+    assert not v.is_valid("abc123")
+
+    # Backreferences keep pointing at their own pattern's groups
+    v = val.Regex(r"(a)\1$", r"(b)\1$")
+    assert v.is_valid("aa")
+    assert v.is_valid("bb")
+    assert not v.is_valid("ab")
+
+    # Inline flags only apply to the pattern that sets them
+    v = val.Regex(r"(?i)abc$", r"def$")
+    assert v.is_valid("ABC")
+    assert v.is_valid("def")
+    assert not v.is_valid("DEF")
+
+
+def test_regex_patterns_are_shared():
+    assert val.Regex(r"abc").regexes[0] is val.Regex(r"x", r"abc").regexes[1]
+
+
+def test_type_dispatch():
+    validators = [val.Integer(), val.String(), val.Enum(1, "a"), val.Null(), val.Map(required=False)]
+    dispatch = val.TypeDispatch(validators)
+    assert dispatch.candidates(1) == (0, 2)
+    assert dispatch.candidates("a") == (1, 2)
+    assert dispatch.candidates(None) == (2, 3, 4)
+    assert dispatch.candidates({}) == (2, 4)
+    assert dispatch.candidates(b"a") == (2,)
+
+
+def test_type_dispatch_custom_is_valid():
+    class Digits(val.String):
+        def _is_valid(self, value):
+            return str(value).isdigit()
+
+    assert Digits.instance_types is None
+    assert val.TypeDispatch([Digits()]).candidates(12) == (0,)
+
+
+def test_validators_are_slotted():
+    validators = [val.String(min=1, matches="a"), val.Integer(max=3), val.Regex("a", "b"), val.Map(key=val.String())]
+    for v in validators:
+        assert not hasattr(v, "__dict__")
+        for c in v._constraints_inst:
+            assert not hasattr(c, "__dict__")
+
+
+def test_only_active_constraints_are_kept():
+    assert val.String()._constraints_inst == []
+    assert val.String(ignore_case=True)._constraints_inst == []
+    v = val.String(matches="a.*", exclude="x", min=2)
+    assert [type(c).__name__ for c in v._constraints_inst] == ["LengthMin", "CharacterExclude", "StringMatches"]
+    assert v.validate("x") == [
+        "Length of x is less than 2",
+        "'x' contains excluded character 'x'",
+        "x is not a regex match.",
+    ]
+
+
+def test_key_constraint_checks_keys_once():
+    class Counted(val.String):
+        calls = 0
+
+        def _is_valid(self, value):
+            Counted.calls += 1
+            return super(Counted, self)._is_valid(value)
+
+    v = val.Map(key=Counted())
+    assert v.validate({"a": 1, 2: 1, 3: 1}) == ["Key error - '2' is not a str.", "Key error - '3' is not a str."]
+    assert Counted.calls == 3
@@ -1,7 +1,7 @@
 import re
 from datetime import date, datetime
 import ipaddress
-from .base import Validator
+from .base import Validator, TypeDispatch
 from . import constraints as con
 from .. import util
 
@@ -15,7 +15,9 @@ except ImportError:
 class String(Validator):
     """String validator"""
 
+    __slots__ = ()
     tag = "str"
+    instance_types = (str,)
     constraints = [
         con.LengthMin,
         con.LengthMax,
@@ -33,8 +35,10 @@ class String(Validator):
 class Number(Validator):
     """Number/float validator"""
 
+    __slots__ = ()
     value_type = float
     tag = "num"
+    instance_types = (int, float)
     constraints = [con.Min, con.Max]
 
     def _is_valid(self, value):
@@ -44,8 +48,10 @@ class Number(Validator):
 class Integer(Validator):
     """Integer validator"""
 
+    __slots__ = ()
     value_type = int
     tag = "int"
+    instance_types = (int,)
     constraints = [con.Min, con.Max]
 
     def _is_valid(self, value):
@@ -55,7 +61,9 @@ class Integer(Validator):
 class Boolean(Validator):
     """Boolean validator"""
 
+    __slots__ = ()
     tag = "bool"
+    instance_types = (bool,)
 
     def _is_valid(self, value):
         return isinstance(value, bool)
@@ -64,6 +72,7 @@ class Boolean(Validator):
 class Enum(Validator):
     """Enum validator"""
 
+    __slots__ = ("enums",)
     tag = "enum"
 
     def __init__(self, *args, **kwargs):
@@ -80,8 +89,10 @@ class Enum(Validator):
 class Day(Validator):
     """Day validator. Format: YYYY-MM-DD"""
 
+    __slots__ = ()
     value_type = date
     tag = "day"
+    instance_types = (date,)
     constraints = [con.Min, con.Max]
 
     def _is_valid(self, value):
@@ -91,8 +102,10 @@ class Day(Validator):
 class Timestamp(Validator):
     """Timestamp validator. Format: YYYY-MM-DD HH:MM:SS"""
 
+    __slots__ = ()
     value_type = datetime
     tag = "timestamp"
+    instance_types = (datetime,)
     constraints = [con.Min, con.Max]
 
     def _is_valid(self, value):
@@ -102,12 +115,15 @@ class Timestamp(Validator):
 class Map(Validator):
     """Map and dict validator"""
 
+    __slots__ = ("validators", "dispatch")
     tag = "map"
+    instance_types = (Mapping,)
     constraints = [con.LengthMin, con.LengthMax, con.Key]
 
     def __init__(self, *args, **kwargs):
         super(Map, self).__init__(*args, **kwargs)
         self.validators = [val for val in args if isinstance(val, Validator)]
+        self.dispatch = TypeDispatch(self.validators)
 
     def _is_valid(self, value):
         return isinstance(value, Mapping)
@@ -116,12 +132,15 @@ class Map(Validator):
 class List(Validator):
     """List validator"""
 
+    __slots__ = ("validators", "dispatch")
     tag = "list"
+    instance_types = (Sequence,)
     constraints = [con.LengthMin, con.LengthMax]
 
     def __init__(self, *args, **kwargs):
         super(List, self).__init__(*args, **kwargs)
         self.validators = [val for val in args if isinstance(val, Validator)]
+        self.dispatch = TypeDispatch(self.validators)
 
     def _is_valid(self, value):
         return isinstance(value, Sequence) and not util.isstr(value)
@@ -130,6 +149,7 @@ class List(Validator):
 class Include(Validator):
     """Include validator"""
 
+    __slots__ = ("include_name", "strict")
     tag = "include"
 
     def __init__(self, *args, **kwargs):
@@ -147,10 +167,12 @@ class Include(Validator):
 class Any(Validator):
     """Any of several types validator"""
 
+    __slots__ = ("validators", "dispatch")
     tag = "any"
 
     def __init__(self, *args, **kwargs):
         self.validators = [val for val in args if isinstance(val, Validator)]
+        self.dispatch = TypeDispatch(self.validators)
         super(Any, self).__init__(*args, **kwargs)
 
     def _is_valid(self, value):
@@ -160,6 +182,7 @@ class Any(Validator):
 class Subset(Validator):
     """Subset of several types validator"""
 
+    __slots__ = ("_allow_empty_set", "validators")
     tag = "subset"
 
     def __init__(self, *args, **kwargs):
@@ -188,8 +211,10 @@ class Subset(Validator):
 class Null(Validator):
     """Validates null"""
 
+    __slots__ = ()
     value_type = None
     tag = "null"
+    instance_types = (type(None),)
 
     def _is_valid(self, value):
         return value is None
@@ -198,7 +223,9 @@ class Null(Validator):
 class Regex(Validator):
     """Regular expression validator"""
 
+    __slots__ = ("regex_name", "_regexes", "_match")
     tag = "regex"
+    instance_types = (str,)
     _regex_flags = {"ignore_case": re.I, "multiline": re.M, "dotall": re.S}
 
     def __init__(self, *args, **kwargs):
@@ -208,11 +235,20 @@ class Regex(Validator):
         for k, v in util.get_iter(self._regex_flags):
             flags |= v if kwargs.pop(k, False) else 0
 
-        self.regexes = [re.compile(arg, flags) for arg in args if util.isstr(arg)]
+        self.regexes = [util.compile_regex(arg, flags) for arg in args if util.isstr(arg)]
         super(Regex, self).__init__(*args, **kwargs)
 
+    @property
+    def regexes(self):
+        return self._regexes
+
+    @regexes.setter
+    def regexes(self, regexes):
+        self._regexes = regexes
+        self._match = util.merge_regexes(regexes)
+
     def _is_valid(self, value):
-        return util.isstr(value) and any(r.match(value) for r in self.regexes)
+        return util.isstr(value) and bool(self._match(value))
 
     def get_name(self):
         return self.regex_name or self.tag + " match"
@@ -221,6 +257,7 @@ class Regex(Validator):
 class Ip(Validator):
     """IP address validator"""
 
+    __slots__ = ()
     tag = "ip"
     constraints = [con.IpVersion]
 
@@ -238,26 +275,28 @@ class Ip(Validator):
 class Mac(Regex):
     """MAC address validator"""
 
+    __slots__ = ()
     tag = "mac"
 
     def __init__(self, *args, **kwargs):
         super(Mac, self).__init__(*args, **kwargs)
         self.regexes = [
-            re.compile(r"[0-9a-fA-F]{2}([-:]?)[0-9a-fA-F]{2}(\1[0-9a-fA-F]{2}){4}$"),
-            re.compile(r"[0-9a-fA-F]{4}([-.:]?)[0-9a-fA-F]{4}(\1[0-9a-fA-F]{4})$"),
+            util.compile_regex(r"[0-9a-fA-F]{2}([-:]?)[0-9a-fA-F]{2}(\1[0-9a-fA-F]{2}){4}$"),
+            util.compile_regex(r"[0-9a-fA-F]{4}([-.:]?)[0-9a-fA-F]{4}(\1[0-9a-fA-F]{4})$"),
         ]
 
 
 class SemVer(Regex):
     """Semantic Versioning (semver.org) validator"""
 
+    __slots__ = ()
     tag = "semver"
 
     def __init__(self, *args, **kwargs):
         super(SemVer, self).__init__(*args, **kwargs)
         self.regexes = [
             # https://semver.org/#is-there-a-suggested-regular-expression-regex-to-check-a-semver-string
-            re.compile(
+            util.compile_regex(
                 r"^(?P<major>0|[1-9]\d*)\.(?P<minor>0|[1-9]\d*)\.(?P<patch>0|[1-9]\d*)(?:-(?P<prerelease>(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?(?:\+(?P<buildmetadata>[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$"
             ),
         ]
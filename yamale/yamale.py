@@ -1,13 +1,17 @@
 #!/usr/bin/env python
 from .schema import Schema
+from .schema.schema import _check_max_errors
 from .yamale_error import YamaleError
 
 
-def make_schema(path=None, parser="PyYAML", validators=None, content=None):
+def make_schema(path=None, parser="PyYAML", validators=None, content=None, cache_dir=None):
     # validators = None means use default.
     # Import readers here so we can get version information in setup.py.
     from . import readers
 
+    if cache_dir is not None:
+        return _make_cached_schema(path, parser, validators, content, cache_dir)
+
     raw_schemas = readers.parse_yaml(path, parser, content=content)
     if not raw_schemas:
         raise ValueError("{} is an empty file!".format(path))
@@ -17,6 +21,7 @@ def make_schema(path=None, parser="PyYAML", validators=None, content=None):
         # Additional documents contain Includes.
         for raw_schema in raw_schemas[1:]:
             s.add_include(raw_schema)
+        s.compile()
     except (TypeError, SyntaxError) as e:
         error = "Schema error in file %s\n" % path
         error += str(e)
@@ -25,22 +30,108 @@ def make_schema(path=None, parser="PyYAML", validators=None, content=None):
     return s
 
 
-def make_data(path=None, parser="PyYAML", content=None):
+def _make_cached_schema(path, parser, validators, content, cache_dir):
+    from .schema import cache
+    from . import validators as val
+
+    if path is not None and content is None:
+        with open(path, "rb") as f:
+            raw = f.read()
+    elif content is not None:
+        raw = content.encode("utf-8")
+    else:
+        raw = b""  # Let make_schema complain about the arguments.
+    key = cache.cache_key(raw, parser, validators or val.DefaultValidators)
+
+    s = cache.load(cache_dir, key)
+    if s is None:
+        s = make_schema(path, parser, validators, content)
+        cache.store(cache_dir, key, s)
+    else:
+        s.name = path
+        s.compile()
+    return s
+
+
+def make_data(path=None, parser="PyYAML", content=None, cache=None):
+    """
+    Parse the documents of a file or of ``content``. With a
+    `readers.ParseCache` as ``cache``, files are only parsed again once they
+    change.
+    """
     from . import readers
 
-    raw_data = readers.parse_yaml(path, parser, content=content)
+    if cache is not None and path is not None and content is None:
+        raw_data = cache.parse(path, parser)
+    else:
+        raw_data = readers.parse_yaml(path, parser, content=content)
     if len(raw_data) == 0:
         return [({}, path)]
     return [(d, path) for d in raw_data]
 
 
-def validate(schema, data, strict=True, _raise_error=True):
+def iter_data(path=None, parser="PyYAML", content=None):
+    """
+    Like `make_data`, but yield the ``(data, path)`` of each document as it
+    is parsed, so only one document needs to be in memory at a time.
+    """
+    from . import readers
+
+    # Check the arguments now rather than when iteration starts.
+    documents = readers.iter_yaml(path, parser, content=content)
+    return _iter_data(documents, path)
+
+
+def _iter_data(documents, path):
+    empty = True
+    for d in documents:
+        empty = False
+        yield d, path
+    if empty:
+        yield {}, path
+
+
+def iter_validate(schema, data, strict=True, max_errors=None, memo=False, engine="recursive"):
+    """
+    Like `validate`, but yield the `ValidationResult` of each document in
+    ``data`` as soon as it has been validated, without raising for invalid
+    documents. Together with `iter_data`, documents are parsed and validated
+    one at a time.
+    """
+    for d, path in data:
+        yield schema.validate(d, path, strict, max_errors=max_errors, memo=memo, engine=engine)
+
+
+def stream_validate(schema, path=None, content=None, strict=True, max_errors=None):
+    """
+    Yield the `ValidationResult` of each document of a YAML file, validating
+    it while it is parsed instead of loading it first, so memory stays
+    bounded for very large documents. Only the PyYAML parser is supported.
+    See `yamale.schema.stream` for what is built from the file.
+    """
+    from . import readers
+    from .schema import stream
+
+    with readers.yaml_reader.open_pyyaml_loader(path, content) as loader:
+        yield from stream.iter_results(schema, loader, path, strict, max_errors)
+
+
+def validate(
+    schema, data, strict=True, _raise_error=True, max_errors=None, fail_fast=False, memo=False, engine="recursive"
+):
+    # fail_fast stops at the first error: it is the only error reported and
+    # the remaining documents are not validated.
+    if fail_fast:
+        max_errors = 1
+    _check_max_errors(max_errors)
     results = []
     is_valid = True
     for d, path in data:
-        result = schema.validate(d, path, strict)
+        result = schema.validate(d, path, strict, max_errors=max_errors, memo=memo, engine=engine)
         results.append(result)
         is_valid = is_valid and result.isValid()
+        if fail_fast and not is_valid:
+            break
     if _raise_error and not is_valid:
         raise YamaleError(results)
     return results